@@ -2,10 +2,10 @@
 
 from typing import Final
 
-from kharkiv_metro_core import Config, get_line_display_by_internal, load_metro_data
+from kharkiv_metro_core import Config, get_line_display_by_internal, load_config, load_metro_data
 
 # Get config values
-_config = Config()
+_config = load_config()
 TIMEZONE = Config.TIMEZONE
 DB_PATH = _config.get_db_path()
 LINE_ORDER = [get_line_display_by_internal(line_key, "ua") for line_key in load_metro_data().line_order]
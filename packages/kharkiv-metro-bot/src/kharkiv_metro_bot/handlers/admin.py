@@ -5,6 +5,7 @@ from aiogram.filters import Command, StateFilter
 from aiogram.fsm.context import FSMContext
 from kharkiv_metro_core import get_text as tr
 
+from ..keyboards import get_main_keyboard
 from ..user_data import get_admin_id, get_user_data_db, is_user_data_enabled
 
 
@@ -18,8 +19,6 @@ async def cmd_stats(message: types.Message, state: FSMContext):
     """Get analytics statistics (admin only)."""
     await state.clear()
     if not is_admin(message.from_user.id):
-        from ..keyboards import get_main_keyboard
-
         await message.answer(
             tr("start_message", "ua"),
             reply_markup=get_main_keyboard("ua"),
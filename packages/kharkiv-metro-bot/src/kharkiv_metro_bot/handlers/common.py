@@ -8,7 +8,10 @@ from kharkiv_metro_core import Language, get_text
 
 from ..constants import CommandText
 from ..keyboards import get_language_keyboard, get_lines_keyboard, get_main_keyboard
+from ..states import ScheduleStates
 from ..user_data import get_user_language, set_user_language
+from .route import cmd_route
+from .stations import cmd_stations
 
 
 async def cmd_start(message: types.Message, state: FSMContext, lang: Language = "ua"):
@@ -67,18 +70,8 @@ async def process_language_selection(message: types.Message, state: FSMContext):
     await state.clear()
 
 
-async def menu_route(message: types.Message, state: FSMContext, lang: Language = "ua"):
-    """Handle route button from menu."""
-    # Lazy import to avoid circular dependencies
-    from .route import cmd_route
-
-    await cmd_route(message, state, lang)
-
-
 async def menu_schedule(message: types.Message, state: FSMContext, lang: Language = "ua"):
     """Handle schedule button from menu."""
-    from ..states import ScheduleStates
-
     await state.set_state(ScheduleStates.waiting_for_line)
     msg = await message.answer(
         get_text("select_line", lang),
@@ -87,13 +80,6 @@ async def menu_schedule(message: types.Message, state: FSMContext, lang: Languag
     await state.update_data(active_message_id=msg.message_id)
 
 
-async def menu_stations(message: types.Message, state: FSMContext, lang: Language = "ua"):
-    """Handle stations button from menu."""
-    from .stations import cmd_stations
-
-    await cmd_stations(message, state, lang)
-
-
 async def catch_all_handler(message: types.Message, lang: Language = "ua"):
     """Handle any unhandled messages when NOT in a state."""
     await message.answer(
@@ -145,13 +131,14 @@ def register_common_handlers(dp: Dispatcher):
     dp.message.register(process_language_selection, F.text.in_(["🇺🇦 Українська", "🇬🇧 English"]))
 
     # Menu button handlers - only work when NOT in any state (main menu)
-    # Use i18n to check button text in both languages
-    dp.message.register(menu_route, StateFilter(None), F.text.in_([get_text("route", "ua"), get_text("route", "en")]))
+    # Use i18n to check button text in both languages; route/stations buttons
+    # go straight to their command handlers
+    dp.message.register(cmd_route, StateFilter(None), F.text.in_([get_text("route", "ua"), get_text("route", "en")]))
     dp.message.register(
         menu_schedule, StateFilter(None), F.text.in_([get_text("schedule", "ua"), get_text("schedule", "en")])
     )
     dp.message.register(
-        menu_stations, StateFilter(None), F.text.in_([get_text("stations", "ua"), get_text("stations", "en")])
+        cmd_stations, StateFilter(None), F.text.in_([get_text("stations", "ua"), get_text("stations", "en")])
     )
 
     # Catch-all handler when NOT in a state (for unknown text)
@@ -1,7 +1,6 @@
 """Route handlers for the Telegram bot."""
 
 import asyncio
-import re
 from collections.abc import Callable
 from datetime import datetime, timedelta
 
@@ -36,6 +35,7 @@ from ..user_data import (
 )
 from ..utils import (
     build_line_groups,
+    find_route_cached,
     format_route,
     generate_route_key,
     get_back_texts,
@@ -45,6 +45,7 @@ from ..utils import (
     get_stations_by_line_except,
     get_valid_lines,
     now,
+    run_blocking,
     update_message,
 )
 
@@ -62,13 +63,19 @@ BACK_TEXTS = get_back_texts()
 CANCEL_TEXTS = get_cancel_texts()
 BACK_OR_CANCEL_TEXTS = BACK_TEXTS + CANCEL_TEXTS
 
+# Time offset buttons resolved once per language instead of on every message
+_TIME_OFFSET_MINUTES = {"time_minus_20": -20, "time_minus_10": -10, "time_plus_10": 10, "time_plus_20": 20}
+TIME_OFFSETS: dict[str, dict[str, int]] = {
+    lang: {get_text(key, lang): minutes for key, minutes in _TIME_OFFSET_MINUTES.items()} for lang in ("ua", "en")
+}
+
 
 # ===== Helper Functions =====
 
 
-def _purge_expired_routes() -> None:
+def _purge_expired_routes(current_time: datetime | None = None) -> None:
     """Remove expired cached routes for reminders."""
-    cutoff = now() - _ACTIVE_ROUTE_TTL
+    cutoff = (current_time or now()) - _ACTIVE_ROUTE_TTL
     expired_keys = []
     for key, (_route, _line_groups, created_at) in _active_routes.items():
         if created_at < cutoff:
@@ -80,11 +87,13 @@ def _purge_expired_routes() -> None:
 
 def parse_time(time_str: str) -> datetime | None:
     """Parse time string in HH:MM format."""
-    match = re.match(r"^(\d{1,2}):(\d{2})$", time_str.strip())
-    if not match:
+    hour_str, sep, minute_str = time_str.strip().partition(":")
+    if not sep or len(hour_str) not in (1, 2) or len(minute_str) != 2:
+        return None
+    if not (hour_str.isdecimal() and minute_str.isdecimal()):
         return None
 
-    hour, minute = int(match.group(1)), int(match.group(2))
+    hour, minute = int(hour_str), int(minute_str)
     if not (0 <= hour <= 23 and 0 <= minute <= 59):
         return None
 
@@ -336,12 +345,7 @@ async def process_time_choice(message: types.Message, state: FSMContext, lang: L
 
     if text == get_text("current_time", lang):
         await process_current_time(message, state, lang)
-    elif text in (
-        get_text("time_minus_20", lang),
-        get_text("time_minus_10", lang),
-        get_text("time_plus_10", lang),
-        get_text("time_plus_20", lang),
-    ):
+    elif text in TIME_OFFSETS.get(lang, TIME_OFFSETS["ua"]):
         await process_offset_time(message, state, lang)
     elif text in (get_text("custom_time", lang), get_text("arrival_by", lang)):
         await state.set_state(RouteStates.waiting_for_day_type)
@@ -420,13 +424,7 @@ async def process_current_time(message: types.Message, state: FSMContext, lang:
 
 async def process_offset_time(message: types.Message, state: FSMContext, lang: Language = "ua"):
     """Process time offset selection."""
-    offsets = {
-        get_text("time_minus_20", lang): -20,
-        get_text("time_minus_10", lang): -10,
-        get_text("time_plus_10", lang): 10,
-        get_text("time_plus_20", lang): 20,
-    }
-    offset = offsets.get(message.text, 0)
+    offset = TIME_OFFSETS.get(lang, TIME_OFFSETS["ua"]).get(message.text, 0)
     await _build_and_send_route(message, state, lang, now() + timedelta(minutes=offset))
 
 
@@ -552,33 +550,19 @@ async def back_from_custom_time(message: types.Message, state: FSMContext, lang:
 # ===== Cancel Handlers =====
 
 
-@router.message(RouteStates.waiting_for_from_line, F.text.in_(CANCEL_TEXTS))
-async def cancel_from_line(message: types.Message, state: FSMContext, lang: Language = "ua"):
-    await handle_cancel(message, state, lang)
-
-
-@router.message(RouteStates.waiting_for_from_station, F.text.in_(CANCEL_TEXTS))
-async def cancel_from_station(message: types.Message, state: FSMContext, lang: Language = "ua"):
-    await handle_cancel(message, state, lang)
-
-
-@router.message(RouteStates.waiting_for_to_line, F.text.in_(CANCEL_TEXTS))
-async def cancel_to_line(message: types.Message, state: FSMContext, lang: Language = "ua"):
-    await handle_cancel(message, state, lang)
-
-
-@router.message(RouteStates.waiting_for_to_station, F.text.in_(CANCEL_TEXTS))
-async def cancel_to_station(message: types.Message, state: FSMContext, lang: Language = "ua"):
-    await handle_cancel(message, state, lang)
-
-
-@router.message(RouteStates.waiting_for_time_choice, F.text.in_(CANCEL_TEXTS))
-async def cancel_from_time_choice(message: types.Message, state: FSMContext, lang: Language = "ua"):
-    await handle_cancel(message, state, lang)
-
-
-@router.message(RouteStates.waiting_for_day_type, F.text.in_(CANCEL_TEXTS))
-async def cancel_from_day_type_route(message: types.Message, state: FSMContext, lang: Language = "ua"):
+@router.message(
+    StateFilter(
+        RouteStates.waiting_for_from_line,
+        RouteStates.waiting_for_from_station,
+        RouteStates.waiting_for_to_line,
+        RouteStates.waiting_for_to_station,
+        RouteStates.waiting_for_time_choice,
+        RouteStates.waiting_for_day_type,
+    ),
+    F.text.in_(CANCEL_TEXTS),
+)
+async def cancel_route(message: types.Message, state: FSMContext, lang: Language = "ua"):
+    """Cancel route building from any selection step."""
     await handle_cancel(message, state, lang)
 
 
@@ -612,16 +596,14 @@ async def _build_and_send_route(
         return
 
     try:
-        if arrival_by:
-            route = metro_router.find_route(
-                from_st.id,
-                to_st.id,
-                departure_time,
-                day_type,
-                arrival_by=arrival_by,
-            )
-        else:
-            route = metro_router.find_route(from_st.id, to_st.id, departure_time, day_type)
+        route = await run_blocking(
+            find_route_cached,
+            from_st.id,
+            to_st.id,
+            departure_time,
+            day_type,
+            arrival_by=arrival_by,
+        )
     except MetroClosedError:
         await message.answer(get_text("error_metro_closed", lang), reply_markup=get_main_keyboard(lang))
         await state.clear()
@@ -642,8 +624,9 @@ async def _build_and_send_route(
 
     # Store route for reminder callbacks
     route_key = generate_route_key(route)
-    _purge_expired_routes()
-    _active_routes[route_key] = (route, line_groups, now())
+    created_at = now()
+    _purge_expired_routes(created_at)
+    _active_routes[route_key] = (route, line_groups, created_at)
 
     keyboard = build_reminder_keyboard(route_key, line_groups, lang) if len(route.segments) > 1 else None
 
@@ -669,7 +652,8 @@ async def process_reminder(callback: types.CallbackQuery, lang: Language = "ua")
         await callback.answer(get_text("error_invalid_data", lang))
         return
 
-    _purge_expired_routes()
+    current_time = now()
+    _purge_expired_routes(current_time)
     route_data = _active_routes.get(route_key)
     if not route_data:
         await callback.answer(get_text("error_route_expired", lang))
@@ -686,7 +670,7 @@ async def process_reminder(callback: types.CallbackQuery, lang: Language = "ua")
     exit_segment = segments[-1]
     remind_time = exit_segment.departure_time
 
-    if remind_time <= now():
+    if remind_time <= current_time:
         await callback.answer(get_text("error_reminder_time_passed", lang))
         return
 
@@ -707,7 +691,7 @@ async def process_reminder(callback: types.CallbackQuery, lang: Language = "ua")
     )
 
     # Create new reminder task
-    delay = (remind_time - now()).total_seconds()
+    delay = (remind_time - current_time).total_seconds()
     task = asyncio.create_task(_send_reminder(callback.bot, user_id, exit_segment.to_station, lang, delay, reminder_id))
 
     pending_reminders[user_id] = {"task": task, "time": remind_time, "reminder_id": reminder_id}
@@ -21,13 +21,14 @@ from ..keyboards import (
 )
 from ..states import ScheduleStates
 from ..utils import (
-    format_schedule,
     get_back_texts,
     get_cancel_texts,
     get_current_day_type,
+    get_formatted_schedule,
     get_router,
     get_stations_by_line,
     get_valid_lines,
+    run_blocking,
     update_message,
 )
 
@@ -41,6 +42,29 @@ CANCEL_TEXTS = get_cancel_texts()
 BACK_OR_CANCEL_TEXTS = BACK_TEXTS + CANCEL_TEXTS
 
 
+async def _send_schedule(
+    message: types.Message,
+    state: FSMContext,
+    lang: Language,
+    station_name: str,
+    day_type: DayType,
+) -> None:
+    """Look up a station, send its formatted schedule (or an error reply) and leave the flow."""
+    try:
+        st = get_router().find_station_by_name(station_name, lang)
+        if not st:
+            text = get_text("error_station_not_found", lang, station=station_name)
+        else:
+            text = await run_blocking(get_formatted_schedule, st.id, day_type, lang)
+            if text is None:
+                text = get_text("schedule_not_found", lang, default="❌ Розклад не знайдено")
+    except Exception as e:
+        text = get_text("error_generic", lang, error=str(e))
+
+    await message.answer(text, reply_markup=get_main_keyboard(lang))
+    await state.clear()
+
+
 @command_router.message(Command("schedule"), StateFilter("*"))
 async def cmd_schedule(message: types.Message, state: FSMContext, lang: Language = "ua"):
     """Handle /schedule command."""
@@ -58,38 +82,7 @@ async def cmd_schedule(message: types.Message, state: FSMContext, lang: Language
         await state.update_data(active_message_id=msg.message_id, valid_lines=valid_lines)
         return
 
-    station_name = args[1]
-
-    try:
-        router = get_router()
-        st = router.find_station_by_name(station_name, lang)
-        if not st:
-            await message.answer(
-                get_text("error_station_not_found", lang, station=station_name),
-                reply_markup=get_main_keyboard(lang),
-            )
-            return
-
-        dt = get_current_day_type()
-        schedules = router.get_station_schedule(st.id, None, dt)
-
-        if not schedules:
-            await message.answer(
-                get_text("schedule_not_found", lang, default="❌ Розклад не знайдено"),
-                reply_markup=get_main_keyboard(lang),
-            )
-            return
-
-        result = format_schedule(getattr(st, f"name_{lang}"), schedules, router, lang)
-        await message.answer(result, reply_markup=get_main_keyboard(lang))
-
-    except Exception as e:
-        await message.answer(
-            get_text("error_generic", lang, error=str(e)),
-            reply_markup=get_main_keyboard(lang),
-        )
-
-    await state.clear()
+    await _send_schedule(message, state, lang, args[1], get_current_day_type())
 
 
 @router.message(ScheduleStates.waiting_for_line, ~F.text.in_(BACK_OR_CANCEL_TEXTS))
@@ -130,16 +123,6 @@ async def back_from_schedule_line(message: types.Message, state: FSMContext, lan
     await message.answer(get_text("main_menu", lang), reply_markup=get_main_keyboard(lang))
 
 
-@router.message(ScheduleStates.waiting_for_line, F.text.in_(CANCEL_TEXTS))
-async def cancel_from_schedule_line(message: types.Message, state: FSMContext, lang: Language = "ua"):
-    """Cancel schedule lookup from line."""
-    await state.clear()
-    await message.answer(
-        get_text("schedule_cancelled", lang, default="❌ Перегляд розкладу скасовано"),
-        reply_markup=get_main_keyboard(lang),
-    )
-
-
 @router.message(ScheduleStates.waiting_for_station, ~F.text.in_(BACK_OR_CANCEL_TEXTS))
 async def process_schedule_station(message: types.Message, state: FSMContext, lang: Language = "ua"):
     """Process station selection for schedule."""
@@ -185,16 +168,6 @@ async def back_from_schedule_station(message: types.Message, state: FSMContext,
     )
 
 
-@router.message(ScheduleStates.waiting_for_station, F.text.in_(CANCEL_TEXTS))
-async def cancel_from_schedule_station(message: types.Message, state: FSMContext, lang: Language = "ua"):
-    """Cancel schedule lookup from station."""
-    await state.clear()
-    await message.answer(
-        get_text("schedule_cancelled", lang, default="❌ Перегляд розкладу скасовано"),
-        reply_markup=get_main_keyboard(lang),
-    )
-
-
 @router.message(ScheduleStates.waiting_for_day_type, ~F.text.in_(BACK_OR_CANCEL_TEXTS))
 async def process_day_type(message: types.Message, state: FSMContext, lang: Language = "ua"):
     """Process day type selection and show schedule."""
@@ -208,40 +181,8 @@ async def process_day_type(message: types.Message, state: FSMContext, lang: Lang
         return
 
     data = await state.get_data()
-    station_name = data.get("schedule_station", "")
-
-    try:
-        router = get_router()
-        st = router.find_station_by_name(station_name, lang)
-        if not st:
-            await message.answer(
-                get_text("error_station_not_found", lang, station=station_name),
-                reply_markup=get_main_keyboard(lang),
-            )
-            await state.clear()
-            return
-
-        dt = DayType.WEEKDAY if selected_day == "weekday" else DayType.WEEKEND
-        schedules = router.get_station_schedule(st.id, None, dt)
-
-        if not schedules:
-            await message.answer(
-                get_text("schedule_not_found", lang, default="❌ Розклад не знайдено"),
-                reply_markup=get_main_keyboard(lang),
-            )
-            await state.clear()
-            return
-
-        result = format_schedule(getattr(st, f"name_{lang}"), schedules, router, lang)
-        await message.answer(result, reply_markup=get_main_keyboard(lang))
-
-    except Exception as e:
-        await message.answer(
-            get_text("error_generic", lang, error=str(e)),
-            reply_markup=get_main_keyboard(lang),
-        )
-
-    await state.clear()
+    day_type = DayType.WEEKDAY if selected_day == "weekday" else DayType.WEEKEND
+    await _send_schedule(message, state, lang, data.get("schedule_station", ""), day_type)
 
 
 @router.message(ScheduleStates.waiting_for_day_type, F.text.in_(BACK_TEXTS))
@@ -273,9 +214,9 @@ async def back_from_day_type(message: types.Message, state: FSMContext, lang: La
     )
 
 
-@router.message(ScheduleStates.waiting_for_day_type, F.text.in_(CANCEL_TEXTS))
-async def cancel_from_day_type(message: types.Message, state: FSMContext, lang: Language = "ua"):
-    """Cancel schedule lookup from day_type."""
+@router.message(StateFilter(ScheduleStates), F.text.in_(CANCEL_TEXTS))
+async def cancel_schedule(message: types.Message, state: FSMContext, lang: Language = "ua"):
+    """Cancel schedule lookup from any step."""
     await state.clear()
     await message.answer(
         get_text("schedule_cancelled", lang, default="❌ Перегляд розкладу скасовано"),
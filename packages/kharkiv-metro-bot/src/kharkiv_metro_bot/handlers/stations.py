@@ -65,21 +65,15 @@ async def process_line_selection(message: types.Message, state: FSMContext, lang
     await state.clear()
 
 
-@router.message(StationsStates.waiting_for_line, F.text.in_(BACK_TEXTS))
-async def back_from_stations_line(message: types.Message, state: FSMContext, lang: Language = "ua"):
-    """Go back from stations line - return to main menu."""
+@router.message(StationsStates.waiting_for_line, F.text.in_(BACK_OR_CANCEL_TEXTS))
+async def back_or_cancel_stations(message: types.Message, state: FSMContext, lang: Language = "ua"):
+    """Leave stations lookup: back returns to main menu, cancel reports cancellation."""
     await state.clear()
-    await message.answer(get_text("main_menu", lang), reply_markup=get_main_keyboard(lang))
-
-
-@router.message(StationsStates.waiting_for_line, F.text.in_(CANCEL_TEXTS))
-async def cancel_stations(message: types.Message, state: FSMContext, lang: Language = "ua"):
-    """Cancel stations lookup."""
-    await state.clear()
-    await message.answer(
-        get_text("stations_cancelled", lang, default="❌ Перегляд станцій скасовано"),
-        reply_markup=get_main_keyboard(lang),
-    )
+    if message.text in BACK_TEXTS:
+        text = get_text("main_menu", lang)
+    else:
+        text = get_text("stations_cancelled", lang, default="❌ Перегляд станцій скасовано")
+    await message.answer(text, reply_markup=get_main_keyboard(lang))
 
 
 def register_stations_handlers(dp: Dispatcher):
@@ -1,12 +1,14 @@
 """Keyboard builders for the Telegram bot with i18n support."""
 
+from functools import lru_cache
+
 from aiogram.types import (
     InlineKeyboardButton,
     InlineKeyboardMarkup,
     KeyboardButton,
     ReplyKeyboardMarkup,
 )
-from kharkiv_metro_core import Language, MetroRouter, get_line_display_name, get_text, load_metro_data
+from kharkiv_metro_core import Language, Line, MetroRouter, get_line_display_name, get_text, load_metro_data
 
 
 def get_nav_buttons(lang: Language) -> list[KeyboardButton]:
@@ -14,8 +16,6 @@ def get_nav_buttons(lang: Language) -> list[KeyboardButton]:
     return [KeyboardButton(text=get_text("back", lang)), KeyboardButton(text=get_text("cancel", lang))]
 
 
-from .constants import LINE_ORDER
-
 # Navigation button texts
 NAV_BACK_TEXT = "back"
 NAV_CANCEL_TEXT = "cancel"
@@ -97,36 +97,44 @@ def _get_station_internal_name(router: MetroRouter, display_name: str) -> str |
     return None
 
 
-def get_stations_keyboard_by_line(
+@lru_cache(maxsize=8)
+def _get_line_station_names(router: MetroRouter, lang: Language) -> tuple[tuple[tuple[str, str], ...], ...]:
+    """Get (internal name, display name) pairs of stations per line, in line and station order."""
+    stations_by_line = router.graph.stations_by_line
+    name_attr = f"name_{lang}"
+    return tuple(
+        tuple((st.name_ua, getattr(st, name_attr)) for st in stations_by_line.get(Line(line_key), ()))
+        for line_key in load_metro_data().line_order
+    )
+
+
+@lru_cache(maxsize=64)
+def _get_station_rows(
     router: MetroRouter,
-    lang: Language = "ua",
-    exclude_station: str | None = None,
-) -> ReplyKeyboardMarkup:
-    """Create reply keyboard with stations grouped by line and navigation."""
+    lang: Language,
+    exclude_station: str | None,
+) -> tuple[tuple[str, ...], ...]:
+    """Get station display names grouped by line, 2 per row, without the excluded station."""
     # Convert exclude_station to internal name if provided
     exclude_internal = None
     if exclude_station:
         exclude_internal = _get_station_internal_name(router, exclude_station)
 
-    # Group stations by line using internal names as keys
-    lines_stations: dict[str, list[str]] = {line: [] for line in LINE_ORDER}
+    rows: list[tuple[str, ...]] = []
+    for line_stations in _get_line_station_names(router, lang):
+        names = tuple(display for internal, display in line_stations if internal != exclude_internal)
+        rows.extend(names[i : i + 2] for i in range(0, len(names), 2))
+    return tuple(rows)
 
-    for st in router.stations.values():
-        # Use internal (Ukrainian) line name as key
-        internal_line_name = st.line.display_name_ua
-        if internal_line_name in lines_stations:
-            # Check exclusion using internal name
-            if exclude_internal is None or st.name_ua != exclude_internal:
-                lines_stations[internal_line_name].append(getattr(st, f"name_{lang}"))
-
-    # Build keyboard: stations grouped by line (2 per row)
-    keyboard = []
-    for line_name in LINE_ORDER:
-        stations = lines_stations[line_name]
-        for i in range(0, len(stations), 2):
-            row = [KeyboardButton(text=st) for st in stations[i : i + 2]]
-            keyboard.append(row)
 
+def get_stations_keyboard_by_line(
+    router: MetroRouter,
+    lang: Language = "ua",
+    exclude_station: str | None = None,
+) -> ReplyKeyboardMarkup:
+    """Create reply keyboard with stations grouped by line and navigation."""
+    # Only the names are cached; aiogram models are mutable, so every caller gets its own keyboard
+    keyboard = [[KeyboardButton(text=name) for name in row] for row in _get_station_rows(router, lang, exclude_station)]
     keyboard = _add_nav_buttons(keyboard, lang)
     return ReplyKeyboardMarkup(keyboard=keyboard, resize_keyboard=True)
 
@@ -19,14 +19,16 @@ from kharkiv_metro_bot.handlers import (
 from kharkiv_metro_bot.handlers.common import set_bot_commands
 from kharkiv_metro_bot.handlers.route import restore_pending_reminders
 from kharkiv_metro_bot.middleware.i18n_middleware import I18nMiddleware
+from kharkiv_metro_bot.middleware.throttling_middleware import ThrottlingMiddleware
 from kharkiv_metro_bot.user_data import cleanup_expired_reminders, is_user_data_enabled, track_user
+from kharkiv_metro_bot.utils import warmup_router
 
 from .storage import SqliteStorage
 
 logger = logging.getLogger(__name__)
 
-# Load .env from current working directory
-load_dotenv()
+# Upper bound on updates handled at once; a burst of /route requests queues instead of piling up tasks
+MAX_CONCURRENT_UPDATES = 50
 
 
 # User data middleware
@@ -103,11 +105,13 @@ async def main() -> None:
         logger.warning("User data: Disabled")
 
     bot = Bot(token=get_token())
+    bot.session.middleware(ThrottlingMiddleware())
     storage = SqliteStorage.from_user_data_db()
     removed = storage.cleanup_stale_states(timedelta(hours=12))
     if removed:
         logger.info("Removed %s stale sessions", removed)
     dp = Dispatcher(storage=storage)
+    dp.startup.register(warmup_router)
 
     # Add middleware
     dp.message.middleware(I18nMiddleware())
@@ -123,7 +127,7 @@ async def main() -> None:
     cleanup_task = asyncio.create_task(_cleanup_expired_reminders_task())
 
     try:
-        await dp.start_polling(bot)
+        await dp.start_polling(bot, handle_as_tasks=True, tasks_concurrency_limit=MAX_CONCURRENT_UPDATES)
     finally:
         cleanup_task.cancel()
         await bot.session.close()
@@ -131,6 +135,8 @@ async def main() -> None:
 
 def main_sync() -> None:
     """Synchronous entry point for the bot."""
+    # Load .env from current working directory (only when actually starting the bot)
+    load_dotenv()
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
@@ -0,0 +1,53 @@
+"""Middleware for throttling outgoing Telegram API requests."""
+
+import asyncio
+import time
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import GetUpdates, TelegramMethod
+from aiogram.methods.base import Response, TelegramType
+
+
+class ThrottlingMiddleware(BaseRequestMiddleware):
+    """Token bucket limiter for outgoing bot requests.
+
+    Telegram allows about 30 messages per second per bot. Bursts of replies
+    are spread out evenly instead of running into RetryAfter errors.
+    """
+
+    def __init__(self, rate: float = 30.0) -> None:
+        self.rate = rate
+        self._tokens = rate
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def _acquire(self) -> None:
+        """Wait until a request token is available."""
+        async with self._lock:
+            current = time.monotonic()
+            self._tokens = min(self.rate, self._tokens + (current - self._updated) * self.rate)
+            self._updated = current
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._tokens = 1.0
+                self._updated = time.monotonic()
+            self._tokens -= 1
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        """Throttle the request and retry once if Telegram still asks to wait."""
+        if isinstance(method, GetUpdates):
+            return await make_request(bot, method)
+
+        await self._acquire()
+        try:
+            return await make_request(bot, method)
+        except TelegramRetryAfter as exc:
+            await asyncio.sleep(exc.retry_after)
+            return await make_request(bot, method)
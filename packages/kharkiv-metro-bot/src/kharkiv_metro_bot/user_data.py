@@ -8,10 +8,10 @@ from contextlib import contextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
 
-from kharkiv_metro_core import DEFAULT_LANGUAGE, Config, Language, now
+from kharkiv_metro_core import DEFAULT_LANGUAGE, Language, load_config, now
 
 # Config instance
-_config = Config()
+_config = load_config()
 
 # Feature flag
 _env_enabled = os.getenv("ENABLE_USER_DATA")
@@ -2,10 +2,19 @@
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
+import logging
+import threading
+from collections import defaultdict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache, partial
+from itertools import chain
+from operator import attrgetter
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from aiogram import types
 from aiogram.fsm.context import FSMContext
@@ -13,22 +22,37 @@ from kharkiv_metro_core import (
     Config,
     DayType,
     Language,
+    Line,
     MetroDatabase,
     MetroRouter,
     Route,
+    Station,
+    StationSchedule,
     get_line_display_name,
     get_text,
     init_database,
-    init_schedules,
+    load_config,
     load_metro_data,
 )
 from kharkiv_metro_core import (
     now as core_now,
 )
 
+from .constants import LINE_COLOR_EMOJI
+
 if TYPE_CHECKING:
     pass
 
+logger = logging.getLogger(__name__)
+
+# Color emoji per line, resolved once (Line.color goes through the metro data on every access)
+_LINE_EMOJI: dict[Line, str] = {line: LINE_COLOR_EMOJI.get(line.color, "⚪") for line in Line}
+
+# Blocking work (sqlite queries, routing) runs in a small worker pool so a slow query
+# does not stall other users; the semaphore caps how many jobs can pile up at once.
+_BLOCKING_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="metro-worker")
+_BLOCKING_SLOTS = asyncio.Semaphore(32)
+
 
 def now() -> datetime:
     """Get current time in configured timezone."""
@@ -37,26 +61,114 @@ def now() -> datetime:
 
 def get_db_path() -> str:
     """Get database path."""
-    config = Config()
+    config = load_config()
     db_path = config.get_db_path()
     Path(db_path).parent.mkdir(parents=True, exist_ok=True)
     return db_path
 
 
-def get_router() -> MetroRouter:
-    """Get MetroRouter instance."""
+_router: MetroRouter | None = None
+_router_lock = threading.Lock()
+
+
+def _build_router() -> MetroRouter:
+    """Open (and initialize if missing) the metro database and build a router."""
     db_path = get_db_path()
 
-    if not Path(db_path).exists():
-        db = init_database(db_path)
+    # init_database also scrapes schedules (and tolerates scrape failures)
+    db = init_database(db_path) if not Path(db_path).exists() else MetroDatabase.shared(db_path)
+
+    return MetroRouter(db=db)
+
+
+def get_router() -> MetroRouter:
+    """Get shared MetroRouter instance."""
+    global _router
+    if _router is None:
+        # Startup warmup builds the router in a worker thread, so guard the first build
+        with _router_lock:
+            if _router is None:
+                _router = _build_router()
+    return _router
+
+
+def _prewarm_schedules() -> None:
+    """Build the router and every station schedule ahead of the first request.
+
+    Best effort: a failure is logged and leaves that work to the first request that needs it
+    (failed calls are not cached), so it never keeps the bot from starting.
+    """
+    try:
+        router = get_router()
+    except Exception:
+        logger.exception("Failed to build the router during warmup")
+        return
+    for station_id in router.stations:
         try:
-            init_schedules(db)
+            for day_type in DayType:
+                for lang in ("ua", "en"):
+                    get_formatted_schedule(station_id, day_type, lang)
         except Exception:
-            pass  # Schedules can be added later
-    else:
-        db = MetroDatabase.shared(db_path)
+            logger.exception("Failed to prewarm schedules for %s", station_id)
 
-    return MetroRouter(db=db)
+
+async def warmup_router() -> None:
+    """Build the shared router and schedule texts on startup without blocking the event loop."""
+    await asyncio.to_thread(_prewarm_schedules)
+
+
+@lru_cache(maxsize=256)
+def get_station_schedule_cached(station_id: str, day_type: DayType) -> tuple[StationSchedule, ...]:
+    """Get all schedules for a station (cached, schedules only change on re-scrape)."""
+    return tuple(get_router().get_station_schedule(station_id, None, day_type))
+
+
+@lru_cache(maxsize=512)
+def get_formatted_schedule(station_id: str, day_type: DayType, lang: Language = "ua") -> str | None:
+    """Get formatted schedule text for a station (cached), or None if there is no schedule."""
+    schedules = get_station_schedule_cached(station_id, day_type)
+    if not schedules:
+        return None
+    router = get_router()
+    station = router.stations[station_id]
+    return format_schedule(getattr(station, f"name_{lang}"), list(schedules), router, lang)
+
+
+@lru_cache(maxsize=4096)
+def _find_route_cached(
+    from_id: str,
+    to_id: str,
+    departure_ts: int,
+    day_type: DayType | None,
+    arrival_ts: int | None,
+) -> Route | None:
+    departure_time = datetime.fromtimestamp(departure_ts, Config.TIMEZONE)
+    arrival_by = datetime.fromtimestamp(arrival_ts, Config.TIMEZONE) if arrival_ts is not None else None
+    return get_router().find_route(from_id, to_id, departure_time, day_type, arrival_by=arrival_by)
+
+
+def find_route_cached(
+    from_id: str,
+    to_id: str,
+    departure_time: datetime,
+    day_type: DayType | None = None,
+    arrival_by: datetime | None = None,
+) -> Route | None:
+    """Find route, reusing results computed for the same minute.
+
+    Times are truncated to whole minutes (the router's departure lookups already work per minute),
+    so repeated requests for a popular pair hit the cache.
+    """
+    departure_ts = int(departure_time.replace(second=0, microsecond=0).timestamp())
+    arrival_ts = int(arrival_by.replace(second=0, microsecond=0).timestamp()) if arrival_by else None
+    return _find_route_cached(from_id, to_id, departure_ts, day_type, arrival_ts)
+
+
+async def run_blocking(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run blocking database or routing work in the bounded worker pool."""
+    async with _BLOCKING_SLOTS:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_BLOCKING_EXECUTOR, partial(func, *args, **kwargs))
 
 
 def _normalize_line_key(line_key: str | None) -> str | None:
@@ -132,8 +244,7 @@ def get_stations_by_line(router: MetroRouter, line_key: str, lang: Language = "u
     normalized_key = _normalize_line_key(line_key)
     if not normalized_key:
         return []
-    name_attr = f"name_{lang}"
-    return [getattr(st, name_attr) for st in router.stations.values() if st.line.value == normalized_key]
+    return list(map(attrgetter(f"name_{lang}"), router.graph.stations_by_line.get(Line(normalized_key), ())))
 
 
 def get_stations_by_line_except(
@@ -153,11 +264,11 @@ def get_stations_by_line_except(
     normalized_key = _normalize_line_key(line_key)
     if not normalized_key:
         return []
-    name_attr = f"name_{lang}"
+    get_name = attrgetter(f"name_{lang}")
     return [
-        getattr(st, name_attr)
-        for st in router.stations.values()
-        if st.line.value == normalized_key and getattr(st, name_attr) != exclude_station
+        name
+        for st in router.graph.stations_by_line.get(Line(normalized_key), ())
+        if (name := get_name(st)) != exclude_station
     ]
 
 
@@ -166,16 +277,57 @@ def _format_minutes(duration: int, min_text: str, approximate: bool = False) ->
     return f"{prefix}{duration} {min_text}"
 
 
-def format_route(route: Route, lang: Language = "ua") -> str:
-    """Format route for Telegram."""
-    from kharkiv_metro_core import get_text
+def _format_line_group(
+    from_station: Station,
+    to_station: Station,
+    start_time: datetime | None,
+    end_time: datetime | None,
+    duration: int,
+    get_name: Callable[[Station], str],
+    min_text: str,
+) -> tuple[str, str]:
+    """Format a ride along one line as a header and a times line."""
+    color_emoji = _LINE_EMOJI[from_station.line]
+    if start_time and end_time:
+        time_str = f"{start_time.strftime('%H:%M')} → {end_time.strftime('%H:%M')}"
+        duration_str = f"{duration} {min_text}"
+    else:
+        time_str = duration_str = _format_minutes(duration, min_text, approximate=True)
+
+    return (
+        f"{color_emoji} {get_name(from_station)} → {get_name(to_station)}",
+        f"• {time_str} ({duration_str})",
+    )
+
+
+def _format_group(group: dict, get_name: Callable[[Station], str], min_text: str) -> tuple[str, ...]:
+    """Format one line group (a ride or a transfer) as a block of lines."""
+    if group["is_transfer"]:
+        transfer_time = _format_minutes(group["duration_minutes"], min_text, approximate=not group["computed_delta"])
+        return (
+            "",
+            f"🔄 {get_name(group['from'])} → {get_name(group['to'])} (<{transfer_time})",
+            "",
+        )
+
+    return _format_line_group(
+        group["from"],
+        group["to"],
+        group["departure_time"],
+        group["arrival_time"],
+        group["duration_minutes"],
+        get_name,
+        min_text,
+    )
 
-    from .constants import LINE_COLOR_EMOJI
 
-    if not route.segments:
+def format_route(route: Route, lang: Language = "ua") -> str:
+    """Format route for Telegram."""
+    segments = route.segments
+    if not segments:
         return ""
 
-    name_attr = f"name_{lang}"
+    get_name = attrgetter(f"name_{lang}")
     min_text = get_text("min", lang)
 
     header_duration = (
@@ -184,50 +336,37 @@ def format_route(route: Route, lang: Language = "ua") -> str:
         else f"{route.total_duration_minutes} {min_text}"
     )
 
+    first, last = segments[0], segments[-1]
     lines = [
-        f"🚇 {getattr(route.segments[0].from_station, name_attr)} → {getattr(route.segments[-1].to_station, name_attr)}",
+        f"🚇 {get_name(first.from_station)} → {get_name(last.to_station)}",
         f"⏱ {header_duration}",
         "",
         f"{get_text('route', lang)}:",
     ]
 
-    for group in route.to_line_groups():
-        if group["is_transfer"]:
-            lines.append("")
-            lines.append(
-                f"🔄 {getattr(group['from'], name_attr)} → {getattr(group['to'], name_attr)} "
-                f"(<{_format_minutes(group['duration_minutes'], min_text, approximate=not group['computed_delta'])})"
+    # Fast path: the whole trip is on one line, so there is a single group
+    if not any(seg.is_transfer for seg in segments):
+        duration = sum(seg.duration_minutes for seg in segments)
+        lines.extend(
+            _format_line_group(
+                first.from_station,
+                last.to_station,
+                first.departure_time,
+                last.arrival_time,
+                duration,
+                get_name,
+                min_text,
             )
-            lines.append("")
-            continue
-
-        line = group["line"]
-        color_emoji = LINE_COLOR_EMOJI.get(line.color, "⚪")
-        start_time = group.get("departure_time")
-        end_time = group.get("arrival_time")
-        has_times = start_time and end_time
-        time_str = (
-            f"{start_time.strftime('%H:%M')} → {end_time.strftime('%H:%M')}"
-            if has_times
-            else _format_minutes(group["duration_minutes"], min_text, approximate=True)
-        )
-        duration_str = (
-            f"{group['duration_minutes']} {min_text}"
-            if has_times
-            else _format_minutes(group["duration_minutes"], min_text, approximate=True)
         )
+        return "\n".join(lines)
 
-        lines.append(f"{color_emoji} {getattr(group['from'], name_attr)} → {getattr(group['to'], name_attr)}")
-        lines.append(f"• {time_str} ({duration_str})")
-
+    lines.extend(chain.from_iterable(_format_group(group, get_name, min_text) for group in route.to_line_groups()))
     return "\n".join(lines)
 
 
 def format_schedule(station_name: str, schedules: list, router: MetroRouter, lang: Language = "ua") -> str:
     """Format schedule for Telegram."""
-    from kharkiv_metro_core import get_text
-
-    name_attr = f"name_{lang}"
+    get_name = attrgetter(f"name_{lang}")
     day_type_text = get_text("weekday" if schedules[0].day_type.value == "weekday" else "weekend", lang)
 
     lines = [f"🚇 {station_name}", f"📅 {day_type_text}", ""]
@@ -240,23 +379,24 @@ def format_schedule(station_name: str, schedules: list, router: MetroRouter, lan
         if not dir_station:
             continue
         # Use station name as unique key (handles duplicate IDs for same station)
-        direction_key = getattr(dir_station, name_attr)
+        direction_key = get_name(dir_station)
         if direction_key not in seen_directions:
             seen_directions.add(direction_key)
             unique_schedules.append((sch, dir_station))
 
     for sch, dir_station in unique_schedules[:2]:  # Up to 2 unique directions
         direction_text = get_text("direction", lang)
-        lines.append(f"➡️ {direction_text}: {getattr(dir_station, name_attr)}")
+        lines.append(f"➡️ {direction_text}: {get_name(dir_station)}")
 
-        # Group by hour
-        by_hour: dict[int, list[int]] = {}
+        # Bucket by hour; entries come from the database ordered by hour and minutes.
+        # Rows saved with an impossible hour by older scrapes are skipped.
+        by_hour: list[list[int]] = [[] for _ in range(24)]
         for entry in sch.entries:
-            by_hour.setdefault(entry.hour, []).append(entry.minutes)
-
-        for hour in sorted(by_hour.keys()):
-            minutes = ", ".join(f"{m:02d}" for m in sorted(by_hour[hour]))
-            lines.append(f"{hour:02d}: {minutes}")
+            if 0 <= entry.hour < 24:
+                by_hour[entry.hour].append(entry.minutes)
+        lines.extend(
+            f"{hour:02d}: {', '.join(f'{m:02d}' for m in minutes)}" for hour, minutes in enumerate(by_hour) if minutes
+        )
 
         lines.append("")
 
@@ -267,9 +407,7 @@ def format_stations_list(line_name: str, stations: list[str], lang: Language = "
     """Format stations list."""
     line_key = _normalize_line_key(line_name) or line_name
     display_name = get_line_display_name(line_key, lang)
-    header = f"{display_name}:\n"
-    body = "\n".join(f"• {name}" for name in stations)
-    return header + body
+    return "\n".join([f"{display_name}:", *(f"• {name}" for name in stations)])
 
 
 def get_current_day_type() -> DayType:
@@ -279,13 +417,18 @@ def get_current_day_type() -> DayType:
 
 def build_line_groups(route: Route) -> dict[str, list]:
     """Group route segments by line."""
-    groups: dict[str, list] = {}
+    groups: defaultdict[str, list] = defaultdict(list)
     for seg in route.segments:
         if seg.is_transfer:
             continue
         line_id = seg.from_station.line.color if seg.from_station.line else "unknown"
-        groups.setdefault(line_id, []).append(seg)
-    return groups
+        groups[line_id].append(seg)
+    return dict(groups)
+
+
+@lru_cache(maxsize=1024)
+def _route_key(from_id: str, to_id: str, departure_ts: int) -> str:
+    return hashlib.blake2b(f"{from_id}:{to_id}:{departure_ts}".encode(), digest_size=6).hexdigest()
 
 
 def generate_route_key(route: Route) -> str:
@@ -293,5 +436,4 @@ def generate_route_key(route: Route) -> str:
     from_st = route.segments[0].from_station
     to_st = route.segments[-1].to_station
     departure_ts = int(route.segments[0].departure_time.timestamp())
-    full_key = f"{from_st.id}:{to_st.id}:{departure_ts}"
-    return hashlib.md5(full_key.encode()).hexdigest()[:12]
+    return _route_key(from_st.id, to_st.id, departure_ts)
@@ -2,11 +2,9 @@
 
 from __future__ import annotations
 
-import json
-
 import click
 from click.exceptions import Exit
-from .utils import console, get_db_path, init_or_get_db, run_with_error_handling
+from .utils import echo_json, get_console, get_db_path, init_or_get_db, run_with_error_handling
 
 
 @click.command()
@@ -26,8 +24,8 @@ def init(ctx: click.Context, output: str) -> None:
         init_or_get_db(db_path)
 
         if output == "json":
-            click.echo(json.dumps({"status": "ok", "path": db_path}))
+            echo_json({"status": "ok", "path": db_path})
         else:
-            console.print(f"[green]✓[/green] Database initialized at: {db_path}")
+            get_console().print(f"[green]✓[/green] Database initialized at: {db_path}")
 
     run_with_error_handling(_run, output)
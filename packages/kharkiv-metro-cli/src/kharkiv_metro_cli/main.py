@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import click
-from kharkiv_metro_core import Config
+from kharkiv_metro_core import load_config
 
 from .init_cmd import init
 from .route_cmd import route
@@ -31,7 +31,7 @@ def cli(ctx: click.Context, config_path: str | None, db_path: str | None) -> Non
     """Kharkiv Metro Route Planner CLI."""
     ctx.ensure_object(dict)
 
-    config = Config(config_path)
+    config = load_config(config_path)
     ctx.obj["config"] = config
     ctx.obj["db_path"] = db_path  # CLI override
 
@@ -2,22 +2,22 @@
 
 from __future__ import annotations
 
-import json
 from datetime import datetime
 
 import click
 from click.exceptions import Exit
-from kharkiv_metro_core import Config, MetroClosedError, MetroRouter, now
+from kharkiv_metro_core import Config, MetroClosedError, now
 
 from .utils import (
-    console,
     display_route_simple,
     display_route_table,
+    echo_json,
     find_station_or_exit,
     get_config,
-    get_db,
+    get_console,
     get_lang,
     get_output_format,
+    get_router,
     parse_day_type,
     run_with_error_handling,
 )
@@ -54,25 +54,24 @@ def route(
     show_compact = (not config_compact) if compact else config_compact
 
     def _run() -> None:
-        db = get_db(ctx)
-        router = MetroRouter(db=db)
+        router = get_router(ctx)
 
         # Find stations
         from_st = find_station_or_exit(router, from_station, lang)
         to_st = find_station_or_exit(router, to_station, lang)
 
-        # Parse departure time
+        # Parse departure time (read the clock once for both the default time and date)
+        current_time = now()
         if time:
             hour, minute = map(int, time.split(":"))
         else:
-            current_time = now()
             hour, minute = current_time.hour, current_time.minute
 
         if date:
             year, month, day = map(int, date.split("-"))
             departure_time = datetime(year, month, day, hour, minute, tzinfo=Config.TIMEZONE)
         else:
-            departure_time = now().replace(hour=hour, minute=minute, second=0, microsecond=0)
+            departure_time = current_time.replace(hour=hour, minute=minute, second=0, microsecond=0)
 
         # Determine day type
         day_type_enum = parse_day_type(day_type)
@@ -83,9 +82,9 @@ def route(
         except MetroClosedError:
             error_msg = "Метро закрите та/або на останній потяг неможливо встигнути"
             if fmt == "json":
-                click.echo(json.dumps({"status": "error", "message": error_msg}))
+                echo_json({"status": "error", "message": error_msg})
             else:
-                console.print(f"[red]Error:[/red] {error_msg}")
+                get_console().print(f"[red]Error:[/red] {error_msg}")
             raise Exit(1)
 
         if not route_result:
@@ -105,7 +104,7 @@ def _output_route(route, from_st, to_st, lang: str, fmt: str, compact: bool) ->
             "to": getattr(to_st, f"name_{lang}"),
             "route": route.to_dict(lang),
         }
-        click.echo(json.dumps(result, indent=2, ensure_ascii=False))
+        echo_json(result)
     elif fmt == "simple":
         display_route_simple(route, lang, compact=compact)
     else:
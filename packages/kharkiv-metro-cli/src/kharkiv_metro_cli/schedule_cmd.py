@@ -2,21 +2,22 @@
 
 from __future__ import annotations
 
-import json
 from datetime import time
+from itertools import islice
+from operator import attrgetter
 
 import click
 from click.exceptions import Exit
-from kharkiv_metro_core import DayType, MetroRouter, now
+from kharkiv_metro_core import DayType, now
 from kharkiv_metro_core import get_text as tr
-from rich.table import Table
 
 from .utils import (
-    console,
+    echo_json,
     find_station_or_exit,
-    get_db,
+    get_console,
     get_lang,
     get_output_format,
+    get_router,
     parse_day_type,
     run_with_error_handling,
 )
@@ -65,16 +66,17 @@ def schedule(
     lang = get_lang(ctx, lang)
 
     def _run() -> None:
-        db = get_db(ctx)
-        router = MetroRouter(db=db)
+        router = get_router(ctx)
+        db = router.db
 
         # Find station
         st = find_station_or_exit(router, station, lang)
 
         # Determine day type
+        current_time = now()
         day_type_enum = parse_day_type(day_type)
         if day_type_enum is None:
-            day_type_enum = DayType.WEEKDAY if now().weekday() < 5 else DayType.WEEKEND
+            day_type_enum = DayType.WEEKDAY if current_time.weekday() < 5 else DayType.WEEKEND
 
         # Find direction if specified
         direction_id = None
@@ -88,8 +90,7 @@ def schedule(
         last_departure = db.get_last_departure_time(day_type_enum)
 
         # Check if metro is open
-        check_time = now().time()
-        is_open, _, _ = db.is_metro_open(day_type_enum, check_time)
+        is_open, _, _ = db.is_metro_open(day_type_enum, current_time.time())
 
         # Get schedules
         schedules = router.get_station_schedule(st.id, direction_id, day_type_enum)
@@ -113,12 +114,12 @@ def _output_json(st, schedules, router, lang: str) -> None:
         "schedules": [
             {
                 "direction": router.stations.get(sch.direction_station_id, st).name_ua,
-                "entries": [{"hour": e.hour, "minutes": e.minutes} for e in sch.entries[:20]],
+                "entries": [{"hour": e.hour, "minutes": e.minutes} for e in islice(sch.entries, 20)],
             }
             for sch in schedules
         ],
     }
-    click.echo(json.dumps(result, indent=2, ensure_ascii=False))
+    echo_json(result)
 
 
 def _output_table(
@@ -131,36 +132,37 @@ def _output_table(
     is_open: bool,
 ) -> None:
     """Output schedule in table format."""
-    name_attr = f"name_{lang}"
+    from rich.table import Table
+
+    get_name = attrgetter(f"name_{lang}")
 
     # Show station name and line
     line_name = getattr(st.line, f"display_name_{lang}")
-    console.print(
-        f"[dim]{tr('Station', lang)}:[/dim] {getattr(st, name_attr)} ({line_name} {tr('Line', lang).lower()})"
-    )
+    get_console().print(f"[dim]{tr('Station', lang)}:[/dim] {get_name(st)} ({line_name} {tr('Line', lang).lower()})")
 
     # Collect schedule data
     schedule_data = []
-    all_hours = set()
 
     for sch in schedules:
         dir_st = router.stations.get(sch.direction_station_id)
         if not dir_st:
             continue
 
-        dir_name = getattr(dir_st, name_attr)
-        entries_by_hour: dict[int, list[int]] = {}
+        dir_name = get_name(dir_st)
+        # Hour buckets; entries come from the database ordered by hour and minutes.
+        # Rows saved with an impossible hour by older scrapes are skipped.
+        entries_by_hour: list[list[int]] = [[] for _ in range(24)]
 
         for entry in sch.entries:
-            if entry.hour not in entries_by_hour:
-                entries_by_hour[entry.hour] = []
-            entries_by_hour[entry.hour].append(entry.minutes)
-            all_hours.add(entry.hour)
+            if 0 <= entry.hour < 24:
+                entries_by_hour[entry.hour].append(entry.minutes)
 
-        schedule_data.append((dir_name, entries_by_hour))
+        # Pre-format each hour's cell once so rendering only appends rows
+        cells_by_hour = [", ".join(map("{:02d}".format, minutes)) for minutes in entries_by_hour]
+        schedule_data.append((dir_name, cells_by_hour))
 
     if not schedule_data:
-        console.print("[yellow]No schedule data available[/yellow]")
+        get_console().print("[yellow]No schedule data available[/yellow]")
         return
 
     # Display table
@@ -170,15 +172,10 @@ def _output_table(
     for dir_name, _ in schedule_data:
         table.add_column(dir_name)
 
-    for hour in sorted(all_hours):
-        row = [f"{hour:02d}"]
-        for _, entries_by_hour in schedule_data:
-            minutes_list = entries_by_hour.get(hour, [])
-            if minutes_list:
-                minutes_str = ", ".join(f"{m:02d}" for m in sorted(minutes_list))
-                row.append(minutes_str)
-            else:
-                row.append("")
-        table.add_row(*row)
-
-    console.print(table)
+    # Transpose the per-direction columns into ready-made rows, one tuple per hour
+    columns = [cells_by_hour for _, cells_by_hour in schedule_data]
+    for hour, cells in enumerate(zip(*columns, strict=True)):
+        if any(cells):
+            table.add_row(f"{hour:02d}", *cells)
+
+    get_console().print(table)
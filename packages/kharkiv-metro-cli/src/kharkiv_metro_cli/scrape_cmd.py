@@ -2,10 +2,10 @@
 
 from __future__ import annotations
 
-import json
+from itertools import chain
 
 import click
-from .utils import console, get_db_path, init_or_get_db, run_with_error_handling
+from .utils import echo_json, get_config, get_console, get_db_path, init_or_get_db, run_with_error_handling
 
 
 @click.command()
@@ -26,30 +26,29 @@ def scrape(ctx: click.Context, output: str) -> None:
         db = init_or_get_db(db_path)
 
         if output == "table":
-            console.print("[cyan]Scraping schedules from metro.kharkiv.ua...[/cyan]")
-            console.print("[dim]This may take 5-10 minutes...[/dim]\n")
+            get_console().print("[cyan]Scraping schedules from metro.kharkiv.ua...[/cyan]")
+            get_console().print("[dim]This may take 5-10 minutes...[/dim]\n")
 
-        scraper = MetroScraper()
+        # Pages are kept between runs so unchanged ones are only revalidated
+        scraper = MetroScraper(cache_dir=get_config(ctx).data_dir / "http_cache")
         all_schedules_dict = scraper.scrape_all_schedules()
 
-        all_schedules = []
-        for station_schedules in all_schedules_dict.values():
-            all_schedules.extend(station_schedules)
+        all_schedules = list(chain.from_iterable(all_schedules_dict.values()))
 
         count = db.save_schedules(all_schedules)
         unique_stations = len(all_schedules_dict)
 
         if output == "json":
-            click.echo(
-                json.dumps(
-                    {
-                        "status": "ok",
-                        "schedules_saved": count,
-                        "stations": unique_stations,
-                    }
-                )
+            echo_json(
+                {
+                    "status": "ok",
+                    "schedules_saved": count,
+                    "stations": unique_stations,
+                }
             )
         else:
-            console.print(f"[green]✓[/green] Saved [bold]{count}[/bold] schedules from {unique_stations} stations")
+            get_console().print(
+                f"[green]✓[/green] Saved [bold]{count}[/bold] schedules from {unique_stations} stations"
+            )
 
     run_with_error_handling(_run, output)
@@ -32,20 +32,15 @@ def stations(ctx: click.Context, line: str | None, lang: str | None, output: str
 
     def _run() -> None:
         db = get_db(ctx)
-        name_attr = f"name_{lang}"
-        line_filter = line
 
         # Map short aliases to full line names
         line_map = {"k": "kholodnohirsko_zavodska", "s": "saltivska", "o": "oleksiivska"}
-        if line_filter:
-            line_filter = line_map.get(line_filter, line_filter)
-            stations_data = db.get_stations_by_line(line_filter)
-        else:
-            stations_data = db.get_all_stations()
+        line_filter = line_map.get(line, line) if line else None
+        stations_data = db.get_station_names(lang, line_filter)
 
-        rows = format_station_rows(stations_data, name_attr, lang)
+        rows = format_station_rows(stations_data, lang)
         if fmt == "json":
-            output_stations_json(rows, stations_data, lang)
+            output_stations_json(rows, stations_data)
         else:
             output_stations_table(rows, lang)
 
@@ -4,31 +4,70 @@ from __future__ import annotations
 
 import json
 import os
-from typing import TYPE_CHECKING, Callable
+import sys
+from functools import lru_cache
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any, Callable
 
 import click
 from click.exceptions import Exit
-from kharkiv_metro_core import Config, MetroDatabase, init_database
-from rich.console import Console
-from rich.table import Table
+from kharkiv_metro_core import (
+    Config,
+    DayType,
+    Line,
+    MetroDatabase,
+    MetroRouter,
+    get_text,
+    init_database,
+    init_stations,
+)
+from kharkiv_metro_core import format_transfers as core_format_transfers
+
+try:
+    import orjson
+except ModuleNotFoundError:  # optional C encoder; the stdlib json module is the fallback
+    orjson = None
 
 if TYPE_CHECKING:
-    from kharkiv_metro_core import Route
+    from datetime import datetime
 
-console = Console()
+    from kharkiv_metro_core import Route, Station
+    from rich.console import Console
+
+
+@lru_cache(maxsize=1)
+def get_console() -> Console:
+    """Get the shared Rich console, importing Rich only when it is first needed."""
+    from rich.console import Console
+
+    return Console()
+
+
+def echo_json(data: Any) -> None:
+    """Print JSON, indented for a terminal and compact when piped or redirected."""
+    pretty = sys.stdout.isatty()
+    if orjson is not None:
+        # click.echo writes bytes straight to the binary stream, so the UTF-8 output is never decoded
+        option = orjson.OPT_APPEND_NEWLINE | (orjson.OPT_INDENT_2 if pretty else 0)
+        click.echo(orjson.dumps(data, option=option), nl=False)
+        return
+    # Encode incrementally into stdout rather than building the whole document as one string
+    out = click.get_text_stream("stdout")
+    if pretty:
+        json.dump(data, out, indent=2, ensure_ascii=False)
+    else:
+        json.dump(data, out, separators=(",", ":"), ensure_ascii=False)
+    out.write("\n")
+    out.flush()
 
 
 def _(key: str, lang: str = "ua") -> str:
     """Get translation from core i18n."""
-    from kharkiv_metro_core import get_text
-
     return get_text(key, lang)
 
 
 def format_transfers(count: int, lang: str = "ua") -> str:
     """Format transfer count."""
-    from kharkiv_metro_core import format_transfers as core_format_transfers
-
     return core_format_transfers(count, lang)
 
 
@@ -44,20 +83,36 @@ def get_db_path(ctx: click.Context) -> str:
     return get_config(ctx).get_db_path()
 
 
+# Every SQLite database file starts with a 100-byte header
+SQLITE_HEADER_SIZE = 100
+
+
+def db_file_exists(db_path: str) -> bool:
+    """Check that a database file exists and is not empty or truncated."""
+    try:
+        return os.path.getsize(db_path) >= SQLITE_HEADER_SIZE
+    except OSError:
+        return False
+
+
 def ensure_db(db_path: str) -> MetroDatabase:
     """Ensure database exists and return it."""
-    if not os.path.exists(db_path):
-        console.print(f"[red]✗[/red] Database not found at: {db_path}")
-        console.print("[yellow]Run:[/yellow] metro init")
+    if not db_file_exists(db_path):
+        get_console().print(f"[red]✗[/red] Database not found at: {db_path}")
+        get_console().print("[yellow]Run:[/yellow] metro init")
         raise Exit(1)
     return MetroDatabase.shared(db_path)
 
 
 def init_or_get_db(db_path: str) -> MetroDatabase:
     """Initialize database if needed and return it."""
-    if not os.path.exists(db_path):
+    if not db_file_exists(db_path):
         return init_database(db_path)
-    return MetroDatabase.shared(db_path)
+    db = MetroDatabase.shared(db_path)
+    # A file opened elsewhere first (e.g. by the MCP server) has the schema but no stations
+    if not db.has_stations():
+        init_stations(db)
+    return db
 
 
 def get_db(ctx: click.Context) -> MetroDatabase:
@@ -65,6 +120,17 @@ def get_db(ctx: click.Context) -> MetroDatabase:
     return ensure_db(get_db_path(ctx))
 
 
+@lru_cache(maxsize=4)
+def _router_for(db: MetroDatabase) -> MetroRouter:
+    return MetroRouter(db=db)
+
+
+def get_router(ctx: click.Context) -> MetroRouter:
+    """Get router for the database, reused by later commands in the same process."""
+    # MetroDatabase.shared returns one instance per path, so it works as the cache key
+    return _router_for(get_db(ctx))
+
+
 def get_lang(ctx: click.Context, value: str | None) -> str:
     """Get language from option or config."""
     return value or get_config(ctx).get("preferences.language", "ua")
@@ -77,8 +143,6 @@ def get_output_format(ctx: click.Context, value: str | None, key: str, default:
 
 def parse_day_type(value: str | None):
     """Parse day type option into enum."""
-    from kharkiv_metro_core import DayType
-
     if not value:
         return None
     return DayType.WEEKDAY if value == "weekday" else DayType.WEEKEND
@@ -99,30 +163,38 @@ def run_with_error_handling(func: Callable[[], None], output: str | None = None)
         func()
     except Exception as e:
         if output == "json":
-            click.echo(json.dumps({"status": "error", "message": str(e)}))
+            echo_json({"status": "error", "message": str(e)})
         else:
-            console.print(f"[red]Error:[/red] {e}")
+            get_console().print(f"[red]Error:[/red] {e}")
         raise Exit(1)
 
 
-def _format_minutes(duration: int, lang: str, approximate: bool = False) -> str:
+def _format_minutes(duration: int, min_text: str, approximate: bool = False) -> str:
     prefix = "~" if approximate and duration == 2 else ""
-    return f"{prefix}{duration} {_('min', lang)}"
+    return f"{prefix}{duration} {min_text}"
+
+
+def _hhmm(value: datetime) -> str:
+    # Same result as strftime("%H:%M") without the locale-aware C formatting path
+    return f"{value.hour:02d}:{value.minute:02d}"
 
 
 def display_route_table(route: Route, lang: str, compact: bool = False) -> None:
     """Display route as table."""
+    from rich.table import Table
+
     total = route.total_duration_minutes
+    min_text = _("min", lang)
     transfers = format_transfers(route.num_transfers, lang)
 
     # Time header
     if route.departure_time and route.arrival_time:
-        dep = route.departure_time.strftime("%H:%M")
-        arr = route.arrival_time.strftime("%H:%M")
-        time_str = f"{dep} → {arr} | {_format_minutes(total, lang)}, {transfers}"
+        dep = _hhmm(route.departure_time)
+        arr = _hhmm(route.arrival_time)
+        time_str = f"{dep} → {arr} | {_format_minutes(total, min_text)}, {transfers}"
     else:
-        time_str = f"{_format_minutes(total, lang, approximate=True)}, {transfers}"
-    console.print(f"[dim]{time_str}[/dim]")
+        time_str = f"{_format_minutes(total, min_text, approximate=True)}, {transfers}"
+    get_console().print(f"[dim]{time_str}[/dim]")
 
     # Build table
     table = Table(show_header=True, header_style="bold magenta")
@@ -132,40 +204,36 @@ def display_route_table(route: Route, lang: str, compact: bool = False) -> None:
     table.add_column(_("Time", lang))
 
     if compact:
-        segments = _group_segments(route, lang)
-        for seg in segments:
-            from_name = seg["from"]
-            to_name = seg["to"]
-            line_str = seg["line"]
-            time_str = seg["time"]
-            table.add_row(from_name, to_name, line_str, time_str)
+        for row in _group_segments(route, lang):
+            table.add_row(*row)
     else:
-        name_attr = f"name_{lang}"
+        get_name = attrgetter(f"name_{lang}")
+        get_line_name = attrgetter(f"display_name_{lang}")
+        transfer_label = f"[yellow]{_('Transfer', lang)}[/yellow]"
         for group in route.to_line_groups():
-            from_name = getattr(group["from"], name_attr)
-            to_name = getattr(group["to"], name_attr)
+            from_name = get_name(group["from"])
+            to_name = get_name(group["to"])
+            duration = group["duration_minutes"]
 
             if group["is_transfer"]:
-                line_str = f"[yellow]{_('Transfer', lang)}[/yellow]"
-                time_str = (
-                    f"<{_format_minutes(group['duration_minutes'], lang, approximate=not group['computed_delta'])}"
-                )
+                line_str = transfer_label
+                time_str = f"<{_format_minutes(duration, min_text, approximate=not group['computed_delta'])}"
             else:
                 line = group["line"]
-                line_name = getattr(line, f"display_name_{lang}")
+                line_name = get_line_name(line)
                 line_str = f"[{line.color}]{line_name}[/{line.color}]"
                 start_time = group.get("departure_time")
                 end_time = group.get("arrival_time")
                 if start_time and end_time:
-                    dep = start_time.strftime("%H:%M")
-                    arr = end_time.strftime("%H:%M")
-                    time_str = f"{dep} → {arr} | {_format_minutes(group['duration_minutes'], lang)}"
+                    dep = _hhmm(start_time)
+                    arr = _hhmm(end_time)
+                    time_str = f"{dep} → {arr} | {_format_minutes(duration, min_text)}"
                 else:
-                    time_str = _format_minutes(group["duration_minutes"], lang, approximate=True)
+                    time_str = _format_minutes(duration, min_text, approximate=True)
 
             table.add_row(from_name, to_name, line_str, time_str)
 
-    console.print(table)
+    get_console().print(table)
 
 
 def display_route_simple(route: Route, lang: str, compact: bool = False) -> None:
@@ -173,14 +241,15 @@ def display_route_simple(route: Route, lang: str, compact: bool = False) -> None
     if not route.segments:
         return
 
-    name_attr = f"name_{lang}"
+    get_name = attrgetter(f"name_{lang}")
 
     # Build path string
-    path_str = _build_compact_path(route, name_attr) if compact else _build_full_path(route, name_attr)
+    path_str = _build_compact_path(route, get_name) if compact else _build_full_path(route, get_name)
 
     # Time info
     total = route.total_duration_minutes
     transfers = format_transfers(route.num_transfers, lang)
+    min_text = _("min", lang)
 
     # Group time by line segments (between transfers)
     time_parts = []
@@ -196,137 +265,144 @@ def display_route_simple(route: Route, lang: str, compact: bool = False) -> None
             has_times = False
             continue
 
-        dep = start_time.strftime("%H:%M")
-        arr = end_time.strftime("%H:%M")
+        dep = _hhmm(start_time)
+        arr = _hhmm(end_time)
         time_parts.append(f"{dep} → {arr}")
 
     if time_parts:
-        time_str = "; ".join(time_parts) + f" | {_format_minutes(total, lang, approximate=not has_times)}, {transfers}"
+        time_str = (
+            "; ".join(time_parts) + f" | {_format_minutes(total, min_text, approximate=not has_times)}, {transfers}"
+        )
     else:
-        time_str = f"{_format_minutes(total, lang, approximate=True)}, {transfers}"
+        time_str = f"{_format_minutes(total, min_text, approximate=True)}, {transfers}"
 
-    console.print(f"[dim]{time_str}[/dim]")
-    console.print(path_str)
+    get_console().print(f"[dim]{time_str}[/dim]")
+    get_console().print(path_str)
 
 
-def format_station_rows(stations_data: list[dict], name_attr: str, lang: str) -> list[tuple[str, str]]:
-    """Prepare station rows with line names."""
-    from kharkiv_metro_core import Line
-
-    rows = []
-    for station in stations_data:
-        line_enum = Line(station["line"])
-        line_name = line_enum.display_name_ua if lang == "ua" else line_enum.display_name_en
-        rows.append((line_name, station[name_attr]))
-    return rows
+def format_station_rows(stations_data: list[tuple[str, str, str]], lang: str) -> list[tuple[str, str]]:
+    """Prepare (line name, station name) rows from (id, name, line) station rows."""
+    # Resolve each line's display name once instead of building a Line per row
+    line_names = {line.value: (line.display_name_ua if lang == "ua" else line.display_name_en) for line in Line}
+    return [(line_names[line], name) for _id, name, line in stations_data]
 
 
 def output_stations_table(rows: list[tuple[str, str]], lang: str) -> None:
     """Output stations in table format."""
+    from rich.table import Table
+
     table = Table(show_header=True, header_style="bold magenta")
     table.add_column(_("Line", lang))
     table.add_column(_("Station", lang))
     for line_name, station_name in rows:
         table.add_row(line_name, station_name)
-    console.print(table)
+    get_console().print(table)
 
 
-def output_stations_json(rows: list[tuple[str, str]], stations_data: list[dict], lang: str) -> None:
+def output_stations_json(rows: list[tuple[str, str]], stations_data: list[tuple[str, str, str]]) -> None:
     """Output stations in JSON format."""
     result = [
         {
-            "id": station["id"],
-            "name": station[f"name_{lang}"],
+            "id": station_id,
+            "name": station_name,
             "line": line_name,
         }
-        for station, (line_name, _station_name) in zip(stations_data, rows, strict=False)
+        for (station_id, station_name, _line), (line_name, _station_name) in zip(stations_data, rows, strict=False)
     ]
-    click.echo(json.dumps(result, indent=2, ensure_ascii=False))
+    echo_json(result)
 
 
-def _group_segments(route: Route, lang: str) -> list[dict]:
-    """Group segments by line for compact view."""
+def _group_segments(route: Route, lang: str) -> list[tuple[str, str, str, str]]:
+    """Group segments by line for compact view, as (from, to, line, time) table rows."""
     result = []
-    name_attr = f"name_{lang}"
+    get_name = attrgetter(f"name_{lang}")
+    get_line_name = attrgetter(f"display_name_{lang}")
+    min_text = _("min", lang)
+    transfer_label = f"[yellow]{_('Transfer', lang)}[/yellow]"
 
     for group in route.to_line_groups():
+        duration = group["duration_minutes"]
         if group["is_transfer"]:
             result.append(
-                {
-                    "from": getattr(group["from"], name_attr),
-                    "to": getattr(group["to"], name_attr),
-                    "line": f"[yellow]{_('Transfer', lang)}[/yellow]",
-                    "time": f"<{_format_minutes(group['duration_minutes'], lang, approximate=not group['computed_delta'])}",
-                }
+                (
+                    get_name(group["from"]),
+                    get_name(group["to"]),
+                    transfer_label,
+                    f"<{_format_minutes(duration, min_text, approximate=not group['computed_delta'])}",
+                )
             )
             continue
 
         line = group["line"]
-        line_name = getattr(line, f"display_name_{lang}")
+        line_name = get_line_name(line)
         start_time = group.get("departure_time")
         end_time = group.get("arrival_time")
         has_times = start_time and end_time
         time_str = (
-            f"{start_time.strftime('%H:%M')} → {end_time.strftime('%H:%M')} | {_format_minutes(group['duration_minutes'], lang)}"
+            f"{_hhmm(start_time)} → {_hhmm(end_time)} | {_format_minutes(duration, min_text)}"
             if has_times
-            else _format_minutes(group["duration_minutes"], lang, approximate=True)
+            else _format_minutes(duration, min_text, approximate=True)
         )
 
         result.append(
-            {
-                "from": getattr(group["from"], name_attr),
-                "to": getattr(group["to"], name_attr),
-                "line": f"[{line.color}]{line_name}[/{line.color}]",
-                "time": time_str,
-            }
+            (
+                get_name(group["from"]),
+                get_name(group["to"]),
+                f"[{line.color}]{line_name}[/{line.color}]",
+                time_str,
+            )
         )
 
     return result
 
 
-def _build_compact_path(route: Route, name_attr: str) -> str:
+def _build_compact_path(route: Route, get_name: Callable[[Station], str]) -> str:
     """Build compact path string."""
-    if not route.segments:
+    segments = route.segments
+    if not segments:
         return ""
 
-    first = route.segments[0].from_station
-    path = f"[{first.line.color}]{getattr(first, name_attr)}[/{first.line.color}]"
+    first = segments[0].from_station
+    color = first.line.color
+    parts = [f"[{color}]{get_name(first)}[/{color}]"]
 
-    for seg in route.segments:
+    for seg in segments:
         if seg.is_transfer:
-            from_name = getattr(seg.from_station, name_attr)
-            to_name = getattr(seg.to_station, name_attr)
             to_color = seg.to_station.line.color
-            path += f" → {from_name} ⇌ [{to_color}]{to_name}[/{to_color}]"
+            parts.append(f" → {get_name(seg.from_station)} ⇌ [{to_color}]{get_name(seg.to_station)}[/{to_color}]")
 
-    last = route.segments[-1]
+    last = segments[-1]
     if not last.is_transfer:
-        path += f" → {getattr(last.to_station, name_attr)}"
+        parts.append(f" → {get_name(last.to_station)}")
 
-    return path
+    return "".join(parts)
 
 
-def _build_full_path(route: Route, name_attr: str) -> str:
+def _build_full_path(route: Route, get_name: Callable[[Station], str]) -> str:
     """Build full path string."""
-    if not route.segments:
+    segments = route.segments
+    if not segments:
         return ""
 
-    first = route.segments[0].from_station
-    path = f"[{first.line.color}]{getattr(first, name_attr)}[/{first.line.color}]"
+    first = segments[0].from_station
+    color = first.line.color
+    parts = [f"[{color}]{get_name(first)}[/{color}]"]
 
-    seen = {getattr(first, name_attr)}
+    # Track stations by id so already-shown stations skip the name lookup entirely
+    seen_ids = {first.id}
 
-    for seg in route.segments:
-        to_name = getattr(seg.to_station, name_attr)
-        if to_name in seen:
+    for seg in segments:
+        to_station = seg.to_station
+        if to_station.id in seen_ids:
             continue
 
+        to_name = get_name(to_station)
         if seg.is_transfer:
-            color = seg.to_station.line.color
-            path += f" ⇌ [{color}]{to_name}[/{color}]"
+            color = to_station.line.color
+            parts.append(f" ⇌ [{color}]{to_name}[/{color}]")
         else:
-            path += f" → {to_name}"
+            parts.append(f" → {to_name}")
 
-        seen.add(to_name)
+        seen_ids.add(to_station.id)
 
-    return path
+    return "".join(parts)
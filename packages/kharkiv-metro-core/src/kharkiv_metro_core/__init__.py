@@ -1,6 +1,6 @@
 """Kharkiv Metro Core Library."""
 
-from .config import Config
+from .config import Config, load_config
 from .data_loader import load_metro_data
 from .database import MetroDatabase
 from .graph import MetroGraph, get_metro_graph
@@ -53,6 +53,7 @@ def __getattr__(name):
 __all__ = [
     # Config
     "Config",
+    "load_config",
     # Models
     "DayType",
     "Line",
@@ -5,6 +5,7 @@ from __future__ import annotations
 import os
 import platform
 import tomllib  # Python 3.11+ only
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 from zoneinfo import ZoneInfo
@@ -115,3 +116,9 @@ class Config:
     def is_user_data_enabled(self) -> bool:
         """Check if user data storage is enabled."""
         return self.get("user_data.enabled", True)
+
+
+@lru_cache(maxsize=8)
+def load_config(config_path: str | None = None) -> Config:
+    """Get the shared Config for a config file path (parsed once per process)."""
+    return Config(config_path)
@@ -3,15 +3,34 @@
 from __future__ import annotations
 
 import datetime as dt
+import os
 import sqlite3
+import threading
 from collections import defaultdict
+from collections.abc import Iterable
 from contextlib import contextmanager
 from pathlib import Path
 
-from .config import Config
+from .config import Config, load_config
 from .models import DayType, ScheduleEntry, StationSchedule
 
 _CONNECTIONS: dict[str, sqlite3.Connection] = {}
+_SHARED_DATABASES: dict[str, MetroDatabase] = {}
+
+# Per-connection settings: a memory-mapped file plus a larger page cache keep the small schedule DB in memory
+_CONNECTION_PRAGMAS = (
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
+# Long-lived shared connections serve mostly reads: WAL lets readers run alongside a re-scrape (and makes
+# synchronous=NORMAL safe). WAL is persistent, so only shared() switches the database file to it.
+_SHARED_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    *_CONNECTION_PRAGMAS,
+)
 
 
 class MetroDatabase:
@@ -19,14 +38,18 @@ class MetroDatabase:
 
     def __init__(self, db_path: str | None = None, connection: sqlite3.Connection | None = None) -> None:
         if db_path is None:
-            from .config import Config
-
-            db_path = Config().get_db_path()
+            db_path = load_config().get_db_path()
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self._connection: sqlite3.Connection | None = connection
         if self._connection is not None:
             self._connection.row_factory = sqlite3.Row
+        # Without a shared connection, each thread keeps one of its own for the lifetime of this object,
+        # so repeated queries reuse sqlite3's per-connection prepared statement cache. All of them are
+        # tracked so close() can release connections opened by other threads too.
+        self._local = threading.local()
+        self._thread_connections: list[sqlite3.Connection] = []
+        self._thread_connections_lock = threading.Lock()
         self._init_db()
 
     @contextmanager
@@ -36,33 +59,58 @@ class MetroDatabase:
             yield self._connection
             return
 
-        conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
-        conn.row_factory = sqlite3.Row
+        conn = getattr(self._local, "connection", None)
+        if conn is None:
+            # Only this thread uses the connection; close() may still close it from another thread
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            for pragma in _CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            with self._thread_connections_lock:
+                self._thread_connections.append(conn)
+            self._local.connection = conn
         try:
             yield conn
-        finally:
-            conn.close()
+        except BaseException:
+            # Closing used to discard a half-done write; keep that behaviour for the reused connection
+            conn.rollback()
+            raise
 
     def close(self) -> None:
-        """Close shared connection if present."""
+        """Close the shared connection if present, and every per-thread connection opened so far."""
+        with self._thread_connections_lock:
+            thread_connections, self._thread_connections = self._thread_connections, []
+            # A fresh thread-local store makes every thread open a new connection on its next query
+            self._local = threading.local()
+        for conn in thread_connections:
+            conn.close()
         if self._connection is not None:
             self._connection.close()
-            _CONNECTIONS.pop(str(self.db_path), None)
+            key = os.path.realpath(self.db_path)
+            _CONNECTIONS.pop(key, None)
+            _SHARED_DATABASES.pop(key, None)
             self._connection = None
 
     @classmethod
     def shared(cls, db_path: str | None = None) -> MetroDatabase:
         """Return a MetroDatabase using a shared connection."""
         if db_path is None:
-            from .config import Config
-
-            db_path = Config().get_db_path()
+            db_path = load_config().get_db_path()
         resolved = str(Path(db_path))
-        if resolved not in _CONNECTIONS:
+        # Key by real path so "metro.db" and "./metro.db" share one connection and one schema check
+        key = os.path.realpath(resolved)
+        database = _SHARED_DATABASES.get(key)
+        if database is not None:
+            return database
+        if key not in _CONNECTIONS:
             conn = sqlite3.connect(resolved, check_same_thread=False)
             conn.row_factory = sqlite3.Row
-            _CONNECTIONS[resolved] = conn
-        return cls(db_path=resolved, connection=_CONNECTIONS[resolved])
+            for pragma in _SHARED_PRAGMAS:
+                conn.execute(pragma)
+            _CONNECTIONS[key] = conn
+        database = cls(db_path=resolved, connection=_CONNECTIONS[key])
+        _SHARED_DATABASES[key] = database
+        return database
 
     def _init_db(self) -> None:
         """Initialize database schema."""
@@ -95,10 +143,23 @@ class MetroDatabase:
                 )
             """)
 
-            # Create indexes
+            # Create indexes. Including hour and minutes makes the timetable lookups covering and
+            # already ordered, so SQLite reads them straight from the index without a sort step.
+            # Runs on every open, so existing databases pick up the new indexes too.
+            cursor.execute("DROP INDEX IF EXISTS idx_schedules_station")
             cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_schedules_station
-                ON schedules(station_id, direction_station_id, day_type)
+                CREATE INDEX IF NOT EXISTS idx_schedules_lookup
+                ON schedules(station_id, direction_station_id, day_type, hour, minutes)
+            """)
+            # First/last departure per day type
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_schedules_day_time
+                ON schedules(day_type, hour, minutes)
+            """)
+            # Station listings, whole network or one line, in route order
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_stations_line_order
+                ON stations(line, station_order)
             """)
 
             conn.commit()
@@ -111,38 +172,6 @@ class MetroDatabase:
     def _schedule_key(schedule: StationSchedule) -> tuple[str, str, str]:
         return schedule.station_id, schedule.direction_station_id, schedule.day_type.value
 
-    def _delete_schedule(self, cursor, schedule: StationSchedule) -> None:
-        cursor.execute(
-            """
-            DELETE FROM schedules
-            WHERE station_id = ? AND direction_station_id = ? AND day_type = ?
-        """,
-            self._schedule_key(schedule),
-        )
-
-    def _insert_schedule_entries(self, cursor, schedule: StationSchedule) -> int:
-        if not schedule.entries:
-            return 0
-
-        cursor.executemany(
-            """
-            INSERT INTO schedules
-            (station_id, direction_station_id, day_type, hour, minutes)
-            VALUES (?, ?, ?, ?, ?)
-        """,
-            [
-                (
-                    schedule.station_id,
-                    schedule.direction_station_id,
-                    schedule.day_type.value,
-                    entry.hour,
-                    entry.minutes,
-                )
-                for entry in schedule.entries
-            ],
-        )
-        return len(schedule.entries)
-
     def save_stations(self, stations: list[dict]) -> None:
         """Save stations to database using batch insert."""
         if not stations:
@@ -175,27 +204,45 @@ class MetroDatabase:
 
     def save_schedule(self, schedule: StationSchedule) -> None:
         """Save schedule entries to database."""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            self._delete_schedule(cursor, schedule)
-            self._insert_schedule_entries(cursor, schedule)
-            conn.commit()
+        self.save_schedules([schedule])
 
     def save_schedules(self, schedules: list[StationSchedule]) -> int:
         """Save multiple schedules to database using single transaction."""
         if not schedules:
             return 0
 
+        # A later schedule replaces an earlier one with the same key, as separate saves would
+        schedules = list({self._schedule_key(schedule): schedule for schedule in schedules}.values())
+
+        # One executemany for all deletes and one for all entries instead of two statements per schedule.
+        # Entry rows are generated as they are inserted rather than materialized as one big list.
+        rows = (
+            (*self._schedule_key(schedule), entry.hour, entry.minutes)
+            for schedule in schedules
+            for entry in schedule.entries
+        )
+
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            count = 0
 
-            for schedule in schedules:
-                self._delete_schedule(cursor, schedule)
-                count += self._insert_schedule_entries(cursor, schedule)
+            cursor.executemany(
+                """
+                DELETE FROM schedules
+                WHERE station_id = ? AND direction_station_id = ? AND day_type = ?
+            """,
+                [self._schedule_key(schedule) for schedule in schedules],
+            )
+            cursor.executemany(
+                """
+                INSERT INTO schedules
+                (station_id, direction_station_id, day_type, hour, minutes)
+                VALUES (?, ?, ?, ?, ?)
+            """,
+                rows,
+            )
 
             conn.commit()
-            return count
+            return sum(len(schedule.entries) for schedule in schedules)
 
     def get_station_schedule(
         self,
@@ -331,13 +378,51 @@ class MetroDatabase:
                 for direction, entries in direction_entries.items()
             ]
 
+    def get_departure_minutes(
+        self,
+        keys: Iterable[tuple[str, str]],
+        day_type: DayType,
+    ) -> dict[tuple[str, str], list[int]]:
+        """Get sorted departure times (minutes since midnight) for (station, direction) pairs in one query."""
+        result: dict[tuple[str, str], list[int]] = {key: [] for key in keys}
+        if not result:
+            return result
+
+        station_ids = {station_id for station_id, _ in result}
+        placeholders = ", ".join("?" * len(station_ids))
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"""
+                SELECT station_id, direction_station_id, hour * 60 + minutes AS minute_of_day
+                FROM schedules
+                WHERE day_type = ? AND station_id IN ({placeholders})
+                ORDER BY station_id, direction_station_id, hour, minutes
+            """,
+                (day_type.value, *station_ids),
+            )
+
+            for row in cursor.fetchall():
+                minutes = result.get((row["station_id"], row["direction_station_id"]))
+                if minutes is not None:
+                    minutes.append(row["minute_of_day"])
+
+        return result
+
+    def has_stations(self) -> bool:
+        """Check if stations table has any data."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1 FROM stations LIMIT 1")
+            return cursor.fetchone() is not None
+
     def has_schedules(self) -> bool:
         """Check if schedules table has any data."""
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM schedules")
-            count = cursor.fetchone()[0]
-            return count > 0
+            # Existence probe: stop at the first row instead of counting the whole table
+            cursor.execute("SELECT 1 FROM schedules LIMIT 1")
+            return cursor.fetchone() is not None
 
     def get_station(self, station_id: str) -> dict | None:
         """Get station by ID."""
@@ -377,7 +462,7 @@ class MetroDatabase:
                 SELECT MAX(hour) as max_hour, MAX(minutes) as max_minutes
                 FROM schedules
                 WHERE day_type = ?
-                AND hour = (SELECT MAX(hour) FROM schedules WHERE day_type = ?)
+                AND hour = (SELECT MAX(hour) FROM schedules WHERE day_type = ? AND hour BETWEEN 0 AND 23)
             """,
                 (day_type.value, day_type.value),
             )
@@ -397,7 +482,7 @@ class MetroDatabase:
                 SELECT MIN(hour) as min_hour, MIN(minutes) as min_minutes
                 FROM schedules
                 WHERE day_type = ?
-                AND hour = (SELECT MIN(hour) FROM schedules WHERE day_type = ?)
+                AND hour = (SELECT MIN(hour) FROM schedules WHERE day_type = ? AND hour BETWEEN 0 AND 23)
             """,
                 (day_type.value, day_type.value),
             )
@@ -412,6 +497,7 @@ class MetroDatabase:
         day_type: DayType,
         check_time: dt.time,
         early_planning_minutes: int = 90,
+        operating_hours: tuple[dt.time | None, dt.time | None] | None = None,
     ) -> tuple[bool, dt.time | None, dt.time | None]:
         """Check if metro is open at given time.
 
@@ -419,11 +505,15 @@ class MetroDatabase:
         - During operating hours (first_departure to last_departure)
         - Up to early_planning_minutes before first departure (allows early planning)
 
+        Callers that already know the (first_departure, last_departure) times can pass them as
+        operating_hours to skip the lookup queries.
+
         Returns:
             Tuple of (is_open, last_departure_time, first_departure_time or None)
         """
-        last_departure = self.get_last_departure_time(day_type)
-        first_departure = self.get_first_departure_time(day_type)
+        if operating_hours is None:
+            operating_hours = (self.get_first_departure_time(day_type), self.get_last_departure_time(day_type))
+        first_departure, last_departure = operating_hours
 
         if last_departure is None or first_departure is None:
             return True, None, None  # No schedules, assume always open
@@ -441,6 +531,19 @@ class MetroDatabase:
         # Metro is closed (after last departure or too early before first departure)
         return False, last_departure, first_departure
 
+    def get_station_names(self, lang: str = "ua", line: str | None = None) -> list[tuple[str, str, str]]:
+        """Get (id, name, line) rows for all stations or one line, ordered by line and station order."""
+        name_column = "name_en" if lang == "en" else "name_ua"
+        query = f"SELECT id, {name_column}, line FROM stations"
+        params: tuple[str, ...] = ()
+        if line:
+            query += " WHERE line = ?"
+            params = (line,)
+        query += " ORDER BY line, station_order"
+
+        with self._get_connection() as conn:
+            return [tuple(row) for row in conn.execute(query, params)]
+
     def get_stations_by_line(self, line: str) -> list[dict]:
         """Get stations by line."""
         with self._get_connection() as conn:
@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import heapq
+import re
+import unicodedata
 from dataclasses import dataclass, field
 from functools import lru_cache
 from operator import attrgetter
@@ -10,8 +12,16 @@ from operator import attrgetter
 from .data_loader import load_metro_data
 from .models import Line, Station, create_stations
 
+_WORD_SPLIT = re.compile(r"[\s\-]+")
 
-@dataclass
+
+@lru_cache(maxsize=512)
+def _normalize_name(name: str) -> str:
+    """Normalize a station name for lookups (Unicode form, stress marks, case and surrounding whitespace)."""
+    return unicodedata.normalize("NFKC", name).replace("\u0301", "").casefold().strip()
+
+
+@dataclass(slots=True)
 class Edge:
     """Edge in the metro graph."""
 
@@ -20,7 +30,7 @@ class Edge:
     is_transfer: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class GraphNode:
     """Node in the metro graph."""
 
@@ -36,9 +46,25 @@ class MetroGraph:
     def __init__(self, stations: dict[str, Station] | None = None) -> None:
         self.stations = stations or create_stations()
         self.nodes: dict[str, GraphNode] = {}
+        self.stations_by_line: dict[Line, list[Station]] = {}
         self._name_index: dict[str, dict[str, Station]] = {}
+        self._partial_names: dict[str, list[tuple[str, Station]]] = {}
+        self._word_matches: dict[str, dict[str, Station]] = {}
+        # Compressed sparse row adjacency over integer station indices, used by the path search
+        self._id2idx: dict[str, int] = {}
+        self._idx2id: list[str] = []
+        self._indptr: list[int] = []
+        self._neighbors: list[int] = []
+        self._weights: list[float] = []
+        # All-pairs shortest paths: travel time and predecessor index per (source, target) index pair
+        self._distances: list[list[float]] = []
+        self._previous: list[list[int]] = []
         self._build_graph()
+        self._build_csr()
+        self._precompute_paths()
         self._build_name_index()
+        # Station data never changes after construction, so repeated lookups (hits and misses) are memoized
+        self._cached_station_lookup = lru_cache(maxsize=256)(self._lookup_station)
 
     def _build_graph(self) -> None:
         """Build graph from stations."""
@@ -47,18 +73,18 @@ class MetroGraph:
         for station_id in self.stations:
             self.nodes[station_id] = GraphNode(station_id=station_id)
 
-        # Add edges between consecutive stations on same line
-        lines_stations: dict[Line, list[Station]] = {
+        # Add edges between consecutive stations on same line (lists are kept as a per-line index)
+        self.stations_by_line = {
             Line.KHOLODNOHIRSKO_ZAVODSKA: [],
             Line.SALTIVSKA: [],
             Line.OLEKSIIVSKA: [],
         }
 
         for station in self.stations.values():
-            lines_stations[station.line].append(station)
+            self.stations_by_line[station.line].append(station)
 
         # Sort by order and add edges
-        for _line, stations in lines_stations.items():
+        for _line, stations in self.stations_by_line.items():
             stations.sort(key=attrgetter("order"))
             for i in range(len(stations) - 1):
                 current = stations[i]
@@ -77,6 +103,22 @@ class MetroGraph:
         if from_id in self.nodes:
             self.nodes[from_id].edges.append(Edge(to_station_id=to_id, weight=weight, is_transfer=is_transfer))
 
+    def _build_csr(self) -> None:
+        """Flatten the per-node edge lists into index arrays for the path search.
+
+        Neighbors of station index ``i`` are ``_neighbors[_indptr[i]:_indptr[i + 1]]`` with matching
+        ``_weights``. Indices follow sorted station ids, so heap ties break exactly as with string ids.
+        """
+        self._idx2id = sorted(self.nodes)
+        self._id2idx = {station_id: idx for idx, station_id in enumerate(self._idx2id)}
+
+        self._indptr = [0]
+        for station_id in self._idx2id:
+            for edge in self.nodes[station_id].edges:
+                self._neighbors.append(self._id2idx[edge.to_station_id])
+                self._weights.append(edge.weight)
+            self._indptr.append(len(self._neighbors))
+
     def _build_name_index(self) -> None:
         """Build station name index for fast lookup."""
         metro_data = load_metro_data()
@@ -84,87 +126,125 @@ class MetroGraph:
             name_attr = f"name_{lang}"
             index: dict[str, Station] = {}
             for station in self.stations.values():
-                name_value = getattr(station, name_attr).lower()
+                name_value = _normalize_name(getattr(station, name_attr))
                 index[name_value] = station
                 normalized = name_value.replace("'", "").replace("«", "").replace("»", "").strip()
                 if normalized and normalized != name_value:
                     index[normalized] = station
             self._name_index[lang] = index
+            # Normalized names in station order, for the partial-match fallback
+            self._partial_names[lang] = [
+                (_normalize_name(getattr(station, name_attr)), station) for station in self.stations.values()
+            ]
+            # Single-word queries are the usual partial input: resolve every word of every name up front
+            # with the same scan, so those lookups become a dict probe with identical results
+            words = {word for station_name, _ in self._partial_names[lang] for word in _WORD_SPLIT.split(station_name)}
+            words.discard("")
+            self._word_matches[lang] = {
+                word: station for word in words if (station := self._match_partial(word, lang)) is not None
+            }
 
         for alias, resolved in metro_data.aliases.items():
-            alias_lower = alias.lower().strip()
-            resolved_lower = resolved.lower().strip()
-            station = self._name_index.get("ua", {}).get(resolved_lower)
+            alias_key = _normalize_name(alias)
+            station = self._name_index.get("ua", {}).get(_normalize_name(resolved))
             if station:
-                self._name_index.setdefault("ua", {})[alias_lower] = station
+                self._name_index.setdefault("ua", {})[alias_key] = station
+
+    def _precompute_paths(self) -> None:
+        """Run one shortest-path search per source station (about 30 of them on this network)."""
+        for start in range(len(self._idx2id)):
+            distances, previous = _shortest_path_tree(self._indptr, self._neighbors, self._weights, start)
+            self._distances.append(distances)
+            self._previous.append(previous)
 
     def find_shortest_path(self, start_id: str, end_id: str) -> tuple[list[str], float] | None:
-        """Find shortest path using Dijkstra's algorithm."""
-        if start_id not in self.nodes or end_id not in self.nodes:
+        """Find shortest path by walking the precomputed predecessor table."""
+        start = self._id2idx.get(start_id)
+        end = self._id2idx.get(end_id)
+        if start is None or end is None:
             return None
 
-        # Dijkstra's algorithm
-        distances: dict[str, float] = {sid: float("inf") for sid in self.nodes}
-        distances[start_id] = 0
-        previous: dict[str, str | None] = dict.fromkeys(self.nodes)
-        visited: set[str] = set()
-
-        # Priority queue: (distance, station_id)
-        pq = [(0.0, start_id)]
-
-        while pq:
-            current_dist, current_id = heapq.heappop(pq)
-
-            if current_id in visited:
-                continue
-            visited.add(current_id)
-
-            if current_id == end_id:
-                break
-
-            node = self.nodes[current_id]
-            for edge in node.edges:
-                neighbor_id = edge.to_station_id
-                if neighbor_id in visited:
-                    continue
-
-                new_dist = current_dist + edge.weight
-                if new_dist < distances[neighbor_id]:
-                    distances[neighbor_id] = new_dist
-                    previous[neighbor_id] = current_id
-                    heapq.heappush(pq, (new_dist, neighbor_id))
-
-        # Reconstruct path
-        if distances[end_id] == float("inf"):
+        distance = self._distances[start][end]
+        if distance == float("inf"):
             return None
 
+        previous = self._previous[start]
         path = []
-        current = end_id
-        while current is not None:
-            path.append(current)
+        current = end
+        while current != -1:
+            path.append(self._idx2id[current])
             current = previous[current]
         path.reverse()
 
-        return path, distances[end_id]
+        return path, distance
 
     def find_station_by_name(self, name: str, lang: str = "ua") -> Station | None:
         """Find station by name (fuzzy matching with old name support)."""
-        name_lower = name.lower().strip()
-        name_attr = f"name_{lang}"
+        return self._cached_station_lookup(name, lang)
+
+    def _lookup_station(self, name: str, lang: str) -> Station | None:
+        name_key = _normalize_name(name)
 
-        station = self._name_index.get(lang, {}).get(name_lower)
+        station = self._name_index.get(lang, {}).get(name_key)
         if station:
             return station
 
-        # Partial match
-        for station in self.stations.values():
-            station_name = getattr(station, name_attr).lower()
-            if name_lower in station_name or station_name in name_lower:
-                return station
+        station = self._word_matches.get(lang, {}).get(name_key)
+        if station:
+            return station
+
+        return self._match_partial(name_key, lang)
 
+    def _match_partial(self, name_key: str, lang: str) -> Station | None:
+        """First station (in station order) whose name contains the query or is contained in it."""
+        for station_name, station in self._partial_names.get(lang, ()):
+            if name_key in station_name or station_name in name_key:
+                return station
         return None
 
 
+def _shortest_path_tree(
+    indptr: list[int],
+    neighbors: list[int],
+    weights: list[float],
+    start: int,
+) -> tuple[list[float], list[int]]:
+    """Dijkstra over CSR adjacency lists from one source to every station index.
+
+    Returns travel times and predecessor indices (-1 for the source and unreachable stations).
+    Kept free of graph objects so the loop touches nothing but local lists and ints.
+    """
+    heappush, heappop = heapq.heappush, heapq.heappop
+    count = len(indptr) - 1
+    distances = [float("inf")] * count
+    distances[start] = 0.0
+    previous = [-1] * count
+    visited = [False] * count
+
+    # Priority queue: (distance, station index)
+    pq = [(0.0, start)]
+
+    while pq:
+        current_dist, current = heappop(pq)
+
+        if visited[current]:
+            continue
+        visited[current] = True
+
+        for j in range(indptr[current], indptr[current + 1]):
+            neighbor = neighbors[j]
+            if visited[neighbor]:
+                continue
+
+            new_dist = current_dist + weights[j]
+            if new_dist < distances[neighbor]:
+                distances[neighbor] = new_dist
+                previous[neighbor] = current
+                heappush(pq, (new_dist, neighbor))
+
+    return distances, previous
+
+
 @lru_cache(maxsize=1)
 def get_metro_graph() -> MetroGraph:
     """Get the singleton MetroGraph instance."""
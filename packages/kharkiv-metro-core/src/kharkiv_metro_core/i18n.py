@@ -1,11 +1,10 @@
 """Internationalization module for Kharkiv Metro."""
 
+import tomllib
 from collections.abc import Callable
 from functools import lru_cache
 from importlib import resources
 
-import toml
-
 from .data_loader import load_metro_data
 
 Language = str
@@ -44,7 +43,7 @@ def _load_translations(lang: Language) -> dict[str, str]:
         _TRANSLATIONS_CACHE[lang] = {}
         return _TRANSLATIONS_CACHE[lang]
 
-    translations = toml.loads(data)
+    translations = tomllib.loads(data)
     _TRANSLATIONS_CACHE[lang] = translations
     return translations
 
@@ -63,6 +62,17 @@ LINE_META: dict[str, dict[str, str]] = load_metro_data().line_meta
 INTERNAL_LINE_NAME_TO_KEY: dict[str, str] = {meta["name_ua"]: key for key, meta in LINE_META.items()}
 
 
+@lru_cache(maxsize=1024)
+def _lookup_text(key: str, lang: Language) -> str:
+    """Resolve a key with default-language and key fallbacks (translations never change at runtime)."""
+    text = _load_translations(lang).get(key)
+    if text is None and lang != DEFAULT_LANGUAGE:
+        text = _load_translations(DEFAULT_LANGUAGE).get(key)
+    if text is None:
+        text = key
+    return text
+
+
 def get_text(key: str, lang: Language = DEFAULT_LANGUAGE, **kwargs) -> str:
     """Get translated text by key.
 
@@ -74,11 +84,7 @@ def get_text(key: str, lang: Language = DEFAULT_LANGUAGE, **kwargs) -> str:
     Returns:
         Translated text
     """
-    text = _load_translations(lang).get(key)
-    if text is None and lang != DEFAULT_LANGUAGE:
-        text = _load_translations(DEFAULT_LANGUAGE).get(key)
-    if text is None:
-        text = key
+    text = _lookup_text(key, lang)
     if kwargs:
         try:
             text = text.format(**kwargs)
@@ -87,6 +93,7 @@ def get_text(key: str, lang: Language = DEFAULT_LANGUAGE, **kwargs) -> str:
     return text
 
 
+@lru_cache(maxsize=64)
 def get_line_display_name(line_key: str, lang: Language = DEFAULT_LANGUAGE) -> str:
     """Get display name for a line.
 
@@ -104,6 +111,7 @@ def get_line_display_name(line_key: str, lang: Language = DEFAULT_LANGUAGE) -> s
     return display_name or line_key
 
 
+@lru_cache(maxsize=64)
 def get_line_short_name(line_key: str, lang: Language = DEFAULT_LANGUAGE) -> str:
     """Get short name for a line (without emoji).
 
@@ -2,27 +2,27 @@
 
 from __future__ import annotations
 
+from itertools import chain
+
 from .database import MetroDatabase
 from .models import create_stations
 
 
 def init_stations(db: MetroDatabase) -> None:
     """Initialize database with station data."""
-    stations = create_stations()
-
-    station_data = []
-    for station in stations.values():
-        station_data.append(
-            {
-                "id": station.id,
-                "name_ua": station.name_ua,
-                "name_en": station.name_en,
-                "line": station.line.value,
-                "order": station.order,
-                "transfer_to": station.transfer_to,
-            }
-        )
-
+    station_data = [
+        {
+            "id": station.id,
+            "name_ua": station.name_ua,
+            "name_en": station.name_en,
+            "line": station.line.value,
+            "order": station.order,
+            "transfer_to": station.transfer_to,
+        }
+        for station in create_stations().values()
+    ]
+
+    # save_stations writes them with a single executemany and one commit
     db.save_stations(station_data)
     print(f"Initialized {len(station_data)} stations")
 
@@ -36,12 +36,10 @@ def init_schedules(db: MetroDatabase) -> None:
 
         print("Scraping all schedules...")
         all_schedules = scraper.scrape_all_schedules()
-        count = 0
-        for station_schedules in all_schedules.values():
-            for schedule in station_schedules:
-                db.save_schedule(schedule)
-                count += 1
-        print(f"Saved {count} schedules total")
+        # One transaction for the whole batch instead of a commit per schedule
+        schedules = list(chain.from_iterable(all_schedules.values()))
+        db.save_schedules(schedules)
+        print(f"Saved {len(schedules)} schedules total")
 
     except Exception as e:
         print(f"Warning: Could not scrape schedules: {e}")
@@ -51,9 +49,9 @@ def init_schedules(db: MetroDatabase) -> None:
 def init_database(db_path: str | None = None) -> MetroDatabase:
     """Initialize database with all static data."""
     if db_path is None:
-        from .config import Config
+        from .config import load_config
 
-        db_path = Config().get_db_path()
+        db_path = load_config().get_db_path()
     db = MetroDatabase.shared(db_path)
     init_stations(db)
     init_schedules(db)
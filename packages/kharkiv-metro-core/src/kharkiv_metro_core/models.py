@@ -3,9 +3,13 @@
 from __future__ import annotations
 
 import datetime as dt
+import heapq
 import math
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
+from itertools import groupby
+from operator import attrgetter
 
 from .data_loader import load_metro_data
 
@@ -69,7 +73,7 @@ class ScheduleEntry:
 
     @property
     def time(self) -> dt.time:
-        return dt.datetime.strptime(f"{self.hour:02d}:{self.minutes:02d}", "%H:%M").time()
+        return dt.time(self.hour, self.minutes)
 
 
 @dataclass(slots=True)
@@ -83,8 +87,9 @@ class StationSchedule:
 
     def get_next_departures(self, after_time: dt.time, limit: int = 3) -> list[ScheduleEntry]:
         """Get next departures at or after given time."""
-        future = [e for e in self.entries if e.time >= after_time]
-        return list(sorted(future, key=lambda entry: (entry.hour, entry.minutes)))[:limit]
+        future = (e for e in self.entries if e.time >= after_time)
+        # Only the first few departures are needed, so avoid sorting the whole remaining day
+        return heapq.nsmallest(limit, future, key=attrgetter("hour", "minutes"))
 
 
 @dataclass(slots=True)
@@ -158,20 +163,11 @@ class Route:
     def iter_line_groups(self) -> list[tuple[list[RouteSegment], bool]]:
         """Group segments by line, marking transfers."""
         groups: list[tuple[list[RouteSegment], bool]] = []
-        segment_index = 0
-        while segment_index < len(self.segments):
-            segment = self.segments[segment_index]
-            if segment.is_transfer:
-                groups.append(([segment], True))
-                segment_index += 1
-                continue
-
-            line_segments = [segment]
-            segment_index += 1
-            while segment_index < len(self.segments) and not self.segments[segment_index].is_transfer:
-                line_segments.append(self.segments[segment_index])
-                segment_index += 1
-            groups.append((line_segments, False))
+        for is_transfer, run in groupby(self.segments, key=attrgetter("is_transfer")):
+            if is_transfer:
+                groups.extend(([segment], True) for segment in run)
+            else:
+                groups.append((list(run), False))
         return groups
 
     def build_path(self, lang: str = "ua", compact: bool = False, transfer_marker: str = "⇌") -> str:
@@ -218,39 +214,30 @@ class Route:
     def to_line_groups(self) -> list[dict]:
         """Build compact line-group summaries."""
         groups: list[dict] = []
-        segment_index = 0
-        while segment_index < len(self.segments):
-            segment = self.segments[segment_index]
-            if segment.is_transfer:
-                transfer_minutes, computed_delta = _compute_transfer_minutes(segment, self.segments, segment_index)
-                groups.append(
-                    {
-                        "from": segment.from_station,
-                        "to": segment.to_station,
-                        "is_transfer": True,
-                        "duration_minutes": transfer_minutes,
-                        "computed_delta": computed_delta,
-                    }
-                )
-                segment_index += 1
+        # Consecutive travel segments collapse into one group; each transfer stays its own group
+        for is_transfer, run in groupby(enumerate(self.segments), key=_segment_is_transfer):
+            if is_transfer:
+                for segment_index, segment in run:
+                    transfer_minutes, computed_delta = _compute_transfer_minutes(segment, self.segments, segment_index)
+                    groups.append(
+                        {
+                            "from": segment.from_station,
+                            "to": segment.to_station,
+                            "is_transfer": True,
+                            "duration_minutes": transfer_minutes,
+                            "computed_delta": computed_delta,
+                        }
+                    )
                 continue
 
-            start = segment
-            end = segment
-            total_duration = segment.duration_minutes
-            segment_index += 1
-
-            while segment_index < len(self.segments) and not self.segments[segment_index].is_transfer:
-                end = self.segments[segment_index]
-                total_duration += end.duration_minutes
-                segment_index += 1
-
+            ride = [segment for _, segment in run]
+            start, end = ride[0], ride[-1]
             groups.append(
                 {
                     "from": start.from_station,
                     "to": end.to_station,
                     "is_transfer": False,
-                    "duration_minutes": total_duration,
+                    "duration_minutes": sum(segment.duration_minutes for segment in ride),
                     "departure_time": start.departure_time,
                     "arrival_time": end.arrival_time,
                     "line": start.from_station.line,
@@ -278,17 +265,33 @@ def _format_minutes(duration: int, min_text: str, approximate: bool = False) ->
     return f"{prefix}{duration} {min_text}"
 
 
+def _plural_category(count: int, lang: str) -> str:
+    """CLDR plural category of a positive count: "one", "few" (Ukrainian only) or "many"."""
+    if lang != "ua":
+        return "one" if count == 1 else "many"
+    mod10, mod100 = count % 10, count % 100
+    if mod10 == 1 and mod100 != 11:
+        return "one"
+    if 2 <= mod10 <= 4 and not 12 <= mod100 <= 14:
+        return "few"
+    return "many"
+
+
+@lru_cache(maxsize=64)
 def format_transfers(count: int, lang: str) -> str:
     """Format transfer count using translations."""
     from .i18n import get_text
 
     if count == 0:
         return get_text("no_transfers", lang)
-    key = f"transfers_{'one' if count == 1 else 'many'}"
-    text = get_text(key, lang)
+    text = get_text(f"transfers_{_plural_category(count, lang)}", lang)
     return text.format(count=count)
 
 
+def _segment_is_transfer(indexed_segment: tuple[int, RouteSegment]) -> bool:
+    return indexed_segment[1].is_transfer
+
+
 def _compute_transfer_minutes(seg: RouteSegment, all_segments: list[RouteSegment], index: int) -> tuple[int, bool]:
     transfer_minutes = seg.duration_minutes
     computed_delta = False
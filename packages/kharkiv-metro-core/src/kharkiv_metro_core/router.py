@@ -3,8 +3,9 @@
 from __future__ import annotations
 
 import datetime as dt
+from bisect import bisect_left, bisect_right
 
-from .config import Config
+from .config import load_config
 from .database import MetroDatabase
 from .graph import MetroGraph, get_metro_graph
 from .models import (
@@ -16,6 +17,15 @@ from .models import (
     Station,
     StationSchedule,
 )
+from .time_utils import now
+
+# Fixed durations used while walking a path; shared instances avoid a timedelta allocation per segment
+_TRANSFER_MINUTES = 3
+_DEFAULT_TRAVEL_MINUTES = 2
+_TRANSFER_DELTA = dt.timedelta(minutes=_TRANSFER_MINUTES)
+_DEFAULT_TRAVEL_DELTA = dt.timedelta(minutes=_DEFAULT_TRAVEL_MINUTES)
+_ONE_MINUTE = dt.timedelta(minutes=1)
+_ONE_DAY = dt.timedelta(days=1)
 
 
 class MetroRouter:
@@ -26,12 +36,19 @@ class MetroRouter:
         db: MetroDatabase | None = None,
         graph: MetroGraph | None = None,
     ) -> None:
-        config = Config()
+        config = load_config()
         self.db = db or MetroDatabase.shared(config.get_db_path())
         self.graph = graph or get_metro_graph()
-        self._line_terminals: dict[Line, tuple[str, str]] | None = None
-        self._next_departure_cache: dict[tuple[str, str, DayType, int, int, int], list] = {}
-        self._previous_departure_cache: dict[tuple[str, str, DayType, int, int, int], list] = {}
+        # Lines are stored sorted by station order, so the terminals are simply both ends
+        self._line_terminals: dict[Line, tuple[str, str]] = {
+            line: (line_stations[0].id, line_stations[-1].id)
+            for line, line_stations in self.graph.stations_by_line.items()
+            if line_stations
+        }
+        # Departure minutes per day type and (station, direction), filled by batched queries
+        self._departure_minutes: dict[DayType, dict[tuple[str, str], list[int]]] = {}
+        # First and last departure per day type; scanning all schedules for them on every check is costly
+        self._operating_hours: dict[DayType, tuple[dt.time | None, dt.time | None]] = {}
 
     @property
     def stations(self) -> dict[str, Station]:
@@ -64,13 +81,13 @@ class MetroRouter:
             if route and route.arrival_time and route.arrival_time > arrival_by:
                 return None
             if route and route.departure_time:
-                is_open, _, _ = self.db.is_metro_open(day_type, route.departure_time.time())
+                is_open, _, _ = self._is_metro_open(day_type, route.departure_time.time())
                 if not is_open:
                     raise MetroClosedError()
             return route
 
         # Check if metro is still open at departure time
-        is_open, last_departure, first_departure = self.db.is_metro_open(day_type, departure_time.time())
+        is_open, last_departure, first_departure = self._is_metro_open(day_type, departure_time.time())
         if not is_open:
             raise MetroClosedError()
 
@@ -79,7 +96,7 @@ class MetroRouter:
 
         # Check if route can be completed before metro closes
         if route and route.arrival_time:
-            is_still_open, _, _ = self.db.is_metro_open(day_type, route.arrival_time.time())
+            is_still_open, _, _ = self._is_metro_open(day_type, route.arrival_time.time())
             if not is_still_open:
                 raise MetroClosedError()
 
@@ -93,12 +110,14 @@ class MetroRouter:
     ) -> Route:
         """Build route with schedule-based timing."""
         # Check if metro is open at start time (or within early planning window)
-        is_open, last_departure, first_departure = self.db.is_metro_open(day_type, start_time.time())
+        is_open, last_departure, first_departure = self._is_metro_open(day_type, start_time.time())
         if not is_open:
             raise MetroClosedError()
 
         # Precompute terminal stations for all lines to avoid repeated calculations
         line_terminals = self._get_line_terminals()
+        # Every timetable the walk below may consult, fetched in one query
+        departures = self._load_departures(path, day_type)
 
         segments: list[RouteSegment] = []
         num_transfers = 0
@@ -109,8 +128,6 @@ class MetroRouter:
 
         # Local variables for faster access (Pattern 9)
         stations = self.stations
-        db = self.db
-        timedelta_minutes = dt.timedelta
 
         for i in range(len(path) - 1):
             from_id = path[i]
@@ -124,8 +141,8 @@ class MetroRouter:
 
             if is_transfer:
                 # Transfer segment
-                duration = 3
-                arrival = current_time + timedelta_minutes(minutes=duration)
+                duration = _TRANSFER_MINUTES
+                arrival = current_time + _TRANSFER_DELTA
                 segment = RouteSegment(
                     from_station=from_station,
                     to_station=to_station,
@@ -148,20 +165,12 @@ class MetroRouter:
                     direction = self._find_terminal_in_path_fast(path, i, current_line, line_terminals)
 
                     # Get exact departure time from schedule at the start of line
-                    current_time_only = dt.time(current_time.hour, current_time.minute)
-                    next_departures = self._get_next_departures(
-                        from_id,
-                        direction,
-                        day_type,
-                        current_time_only,
-                        limit=1,
-                    )
-
-                    if next_departures:
-                        departure = next_departures[0]
-                        departure_dt = dt.datetime.combine(current_time.date(), departure.time, current_time.tzinfo)
+                    departure = _next_minute(departures[from_id, direction], _minute_of_day(current_time))
+
+                    if departure is not None:
+                        departure_dt = _at_minute(current_time, departure)
                         if departure_dt < current_time:
-                            departure_dt += timedelta_minutes(days=1)
+                            departure_dt += _ONE_DAY
                         current_time = departure_dt
                     else:
                         # No departures available - metro is closed
@@ -171,14 +180,14 @@ class MetroRouter:
                 # Try to find when a train arrives at the next station heading same direction
                 arrival_time: dt.datetime | None = None
                 if direction:
-                    arrival_time = self._calculate_arrival_time(to_id, direction, day_type, current_time)
+                    arrival_time = self._calculate_arrival_time(departures[to_id, direction], current_time)
 
                 if arrival_time:
-                    travel_time = int((arrival_time - current_time).total_seconds() / 60)
+                    travel_time = (arrival_time - current_time) // _ONE_MINUTE
                 else:
                     # Fallback to default 2 minutes if no schedule found
-                    travel_time = 2
-                    arrival_time = current_time + timedelta_minutes(minutes=travel_time)
+                    travel_time = _DEFAULT_TRAVEL_MINUTES
+                    arrival_time = current_time + _DEFAULT_TRAVEL_DELTA
 
                 segment = RouteSegment(
                     from_station=from_station,
@@ -193,7 +202,7 @@ class MetroRouter:
 
         # Calculate total duration
         if segments and segments[0].departure_time and segments[-1].arrival_time:
-            total_duration = int((segments[-1].arrival_time - segments[0].departure_time).total_seconds() / 60)
+            total_duration = (segments[-1].arrival_time - segments[0].departure_time) // _ONE_MINUTE
             departure = segments[0].departure_time
             arrival = segments[-1].arrival_time
         else:
@@ -216,11 +225,12 @@ class MetroRouter:
         day_type: DayType,
     ) -> Route:
         """Build route that arrives no later than target time."""
-        is_open, _, _ = self.db.is_metro_open(day_type, arrival_by.time())
+        is_open, _, _ = self._is_metro_open(day_type, arrival_by.time())
         if not is_open:
             raise MetroClosedError()
 
         line_terminals = self._get_line_terminals()
+        departures = self._load_departures(path, day_type)
         reverse_segments: list[RouteSegment] = []
         num_transfers = 0
 
@@ -229,7 +239,6 @@ class MetroRouter:
         direction: str | None = None
 
         stations = self.stations
-        timedelta_minutes = dt.timedelta
 
         for i in range(len(path) - 1, 0, -1):
             from_id = path[i - 1]
@@ -241,8 +250,8 @@ class MetroRouter:
             is_transfer = from_station.transfer_to == to_id
 
             if is_transfer:
-                duration = 3
-                departure = current_time - timedelta_minutes(minutes=duration)
+                duration = _TRANSFER_MINUTES
+                departure = current_time - _TRANSFER_DELTA
                 segment = RouteSegment(
                     from_station=from_station,
                     to_station=to_station,
@@ -267,22 +276,20 @@ class MetroRouter:
 
             if direction:
                 departure_time, arrival_time = self._find_departure_before(
-                    from_id,
-                    to_id,
-                    direction,
-                    day_type,
+                    departures[from_id, direction],
+                    departures[to_id, direction],
                     current_time,
                 )
 
             if departure_time and arrival_time:
-                travel_time = int((arrival_time - departure_time).total_seconds() / 60)
+                travel_time = (arrival_time - departure_time) // _ONE_MINUTE
                 if travel_time <= 0:
-                    travel_time = 2
-                    arrival_time = departure_time + timedelta_minutes(minutes=travel_time)
+                    travel_time = _DEFAULT_TRAVEL_MINUTES
+                    arrival_time = departure_time + _DEFAULT_TRAVEL_DELTA
             else:
-                travel_time = 2
+                travel_time = _DEFAULT_TRAVEL_MINUTES
                 arrival_time = current_time
-                departure_time = current_time - timedelta_minutes(minutes=travel_time)
+                departure_time = current_time - _DEFAULT_TRAVEL_DELTA
 
             segment = RouteSegment(
                 from_station=from_station,
@@ -298,7 +305,7 @@ class MetroRouter:
         segments = list(reversed(reverse_segments))
 
         if segments and segments[0].departure_time and segments[-1].arrival_time:
-            total_duration = int((segments[-1].arrival_time - segments[0].departure_time).total_seconds() / 60)
+            total_duration = (segments[-1].arrival_time - segments[0].departure_time) // _ONE_MINUTE
             departure = segments[0].departure_time
             arrival = segments[-1].arrival_time
         else:
@@ -316,85 +323,82 @@ class MetroRouter:
 
     def _find_departure_before(
         self,
-        from_station_id: str,
-        to_station_id: str,
-        direction: str,
-        day_type: DayType,
+        from_departures: list[int],
+        to_departures: list[int],
         arrival_by: dt.datetime,
         limit: int = 5,
     ) -> tuple[dt.datetime | None, dt.datetime | None]:
         """Find latest departure that arrives before target time."""
-        previous_departures = self._get_previous_departures(
-            from_station_id,
-            direction,
-            day_type,
-            arrival_by.time(),
-            limit=limit,
-        )
-
-        for departure in previous_departures:
-            departure_dt = dt.datetime.combine(arrival_by.date(), departure.time, arrival_by.tzinfo)
+        for departure in _previous_minutes(from_departures, _minute_of_day(arrival_by), limit):
+            departure_dt = _at_minute(arrival_by, departure)
             if departure_dt > arrival_by:
-                departure_dt -= dt.timedelta(days=1)
-            arrival_dt = self._calculate_arrival_time(to_station_id, direction, day_type, departure_dt)
+                departure_dt -= _ONE_DAY
+            arrival_dt = self._calculate_arrival_time(to_departures, departure_dt)
             if arrival_dt and arrival_dt <= arrival_by:
                 return departure_dt, arrival_dt
 
         return None, None
 
-    def _calculate_arrival_time(
-        self,
-        station_id: str,
-        direction: str,
-        day_type: DayType,
-        after_time: dt.datetime,
-    ) -> dt.datetime | None:
+    def _calculate_arrival_time(self, arrivals: list[int], after_time: dt.datetime) -> dt.datetime | None:
         """Calculate arrival time at station based on schedule.
 
-        Looks up when a train arrives at the given station heading in the specified direction.
+        Takes the departures at the next station heading to the same terminal (minutes since midnight).
         Returns None if no schedule is available.
         """
-        # Look up arrivals at the next station heading to the same terminal
-        after_time_only = dt.time(after_time.hour, after_time.minute)
-        arrivals = self._get_next_departures(
-            station_id,
-            direction,
-            day_type,
-            after_time_only,
-            limit=1,
-        )
+        arrival = _next_minute(arrivals, _minute_of_day(after_time))
 
-        if arrivals:
-            arrival = arrivals[0]
+        if arrival is not None:
             # Preserve timezone from after_time - create new datetime with proper tzinfo
-            arrival_dt = dt.datetime.combine(after_time.date(), arrival.time, after_time.tzinfo)
+            arrival_dt = _at_minute(after_time, arrival)
             if arrival_dt < after_time:
-                arrival_dt += dt.timedelta(days=1)
+                arrival_dt += _ONE_DAY
             return arrival_dt
 
         return None
 
-    def _get_line_terminals(self) -> dict[Line, tuple[str, str]]:
-        """Precompute terminal stations for all lines.
+    def _is_metro_open(self, day_type: DayType, check_time: dt.time) -> tuple[bool, dt.time | None, dt.time | None]:
+        """Check if metro is open, looking the operating hours up once per day type."""
+        operating_hours = self._operating_hours.get(day_type)
+        if operating_hours is None:
+            operating_hours = (self.db.get_first_departure_time(day_type), self.db.get_last_departure_time(day_type))
+            self._operating_hours[day_type] = operating_hours
+        return self.db.is_metro_open(day_type, check_time, operating_hours=operating_hours)
+
+    def _load_departures(self, path: list[str], day_type: DayType) -> dict[tuple[str, str], list[int]]:
+        """Get departure minutes for every timetable along path, querying only the ones not loaded yet."""
+        departures = self._departure_minutes.setdefault(day_type, {})
+        missing = self._schedule_keys(path) - departures.keys()
+        if missing:
+            departures.update(self.db.get_departure_minutes(missing, day_type))
+        return departures
+
+    def _schedule_keys(self, path: list[str]) -> set[tuple[str, str]]:
+        """Collect the (station, direction) timetables a route along path can consult."""
+        line_terminals = self._get_line_terminals()
+        stations = self.stations
+        keys: set[tuple[str, str]] = set()
+        current_line: Line | None = None
+        direction = ""
 
-        Returns dict mapping line to (first_terminal_id, last_terminal_id).
-        """
-        if self._line_terminals is not None:
-            return self._line_terminals
+        for i in range(len(path) - 1):
+            from_station = stations[path[i]]
+            if from_station.transfer_to == path[i + 1]:
+                current_line = None
+                continue
+            if current_line is None or from_station.line != current_line:
+                current_line = from_station.line
+                direction = self._find_terminal_in_path_fast(path, i, current_line, line_terminals)
+            keys.add((path[i], direction))
+            keys.add((path[i + 1], direction))
 
-        terminals: dict[Line, tuple[str, str]] = {}
+        return keys
 
-        for line in [Line.KHOLODNOHIRSKO_ZAVODSKA, Line.SALTIVSKA, Line.OLEKSIIVSKA]:
-            line_stations = [(sid, s.order) for sid, s in self.stations.items() if s.line == line]
-            if line_stations:
-                min_order = min(order for _, order in line_stations)
-                max_order = max(order for _, order in line_stations)
-                first_terminal = next(sid for sid, order in line_stations if order == min_order)
-                last_terminal = next(sid for sid, order in line_stations if order == max_order)
-                terminals[line] = (first_terminal, last_terminal)
+    def _get_line_terminals(self) -> dict[Line, tuple[str, str]]:
+        """Terminal stations for all lines.
 
-        self._line_terminals = terminals
-        return terminals
+        Returns dict mapping line to (first_terminal_id, last_terminal_id).
+        """
+        return self._line_terminals
 
     def _find_terminal_in_path_fast(
         self,
@@ -440,38 +444,6 @@ class MetroRouter:
         line_terminals = self._get_line_terminals()
         return self._find_terminal_in_path_fast(path, start_idx, line, line_terminals)
 
-    def _get_next_departures(
-        self,
-        station_id: str,
-        direction_station_id: str,
-        day_type: DayType,
-        after_time: dt.time,
-        limit: int = 3,
-    ) -> list:
-        """Cached next departures lookup."""
-        key = (station_id, direction_station_id, day_type, after_time.hour, after_time.minute, limit)
-        if key in self._next_departure_cache:
-            return self._next_departure_cache[key]
-        result = self.db.get_next_departures(station_id, direction_station_id, day_type, after_time, limit=limit)
-        self._next_departure_cache[key] = result
-        return result
-
-    def _get_previous_departures(
-        self,
-        station_id: str,
-        direction_station_id: str,
-        day_type: DayType,
-        before_time: dt.time,
-        limit: int = 3,
-    ) -> list:
-        """Cached previous departures lookup."""
-        key = (station_id, direction_station_id, day_type, before_time.hour, before_time.minute, limit)
-        if key in self._previous_departure_cache:
-            return self._previous_departure_cache[key]
-        result = self.db.get_previous_departures(station_id, direction_station_id, day_type, before_time, limit=limit)
-        self._previous_departure_cache[key] = result
-        return result
-
     def _get_day_type(self, current_dt: dt.datetime) -> DayType:
         """Determine if date is weekday or weekend."""
         if current_dt.weekday() >= 5:
@@ -486,8 +458,6 @@ class MetroRouter:
     ) -> list[StationSchedule]:
         """Get schedule for a station."""
         if day_type is None:
-            from .time_utils import now
-
             day_type = self._get_day_type(now())
 
         if direction_id:
@@ -499,3 +469,24 @@ class MetroRouter:
     def find_station_by_name(self, name: str, lang: str = "ua") -> Station | None:
         """Find station by name."""
         return self.graph.find_station_by_name(name, lang)
+
+
+def _minute_of_day(value: dt.datetime) -> int:
+    return value.hour * 60 + value.minute
+
+
+def _at_minute(base: dt.datetime, minute_of_day: int) -> dt.datetime:
+    hour, minute = divmod(minute_of_day, 60)
+    return dt.datetime.combine(base.date(), dt.time(hour, minute), base.tzinfo)
+
+
+def _next_minute(departures: list[int], after: int) -> int | None:
+    """First departure at or after the given minute of the day."""
+    idx = bisect_left(departures, after)
+    return departures[idx] if idx < len(departures) else None
+
+
+def _previous_minutes(departures: list[int], before: int, limit: int) -> list[int]:
+    """Up to limit departures at or before the given minute of the day, latest first."""
+    idx = bisect_right(departures, before)
+    return departures[max(idx - limit, 0) : idx][::-1]
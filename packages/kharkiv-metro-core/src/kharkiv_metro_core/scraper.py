@@ -3,38 +3,79 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import json
+import logging
+import os
 import re
+import sys
+import threading
+import unicodedata
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import TYPE_CHECKING, NamedTuple
 from urllib.parse import unquote, urljoin
 
 import aiohttp
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 
 from .data_loader import load_metro_data
 from .models import DayType, ScheduleEntry, StationSchedule, create_stations
 
+try:
+    import lxml  # noqa: F401
+except ModuleNotFoundError:  # optional C parser; BeautifulSoup's pure-Python parser is the fallback
+    HTML_PARSER = "html.parser"
+else:
+    HTML_PARSER = "lxml"
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    import requests
+
+logger = logging.getLogger(__name__)
+
 metro_data = load_metro_data()
 SCRAPER_CONFIG = metro_data.scraper
 BASE_URL = SCRAPER_CONFIG["base_url"]
 
-# Build station name to ID mapping
-_STATION_NAME_TO_ID: dict[str, str] = {}
-for sid, station in create_stations().items():
-    _STATION_NAME_TO_ID[station.name_ua.lower()] = sid
-    # Also add normalized versions
-    normalized = station.name_ua.lower().replace("'", "").replace(" «", "").replace("» ", "")
-    _STATION_NAME_TO_ID[normalized] = sid
+_QUOTES = str.maketrans("", "", "'\"«»")
+
+
+def _absolute_url(href: str) -> str:
+    """Resolve a link against BASE_URL, the site root; links that need real URL resolution go through urljoin."""
+    if not href or ":" in href or "./" in href or href.startswith(("//", "?", "#")):
+        return urljoin(BASE_URL, href)
+    return BASE_URL.rstrip("/") + "/" + href.lstrip("/")
+
+
+def _canonical_name(name: str) -> str:
+    """Normalize a station name for matching (Unicode form, case, quotes and surrounding whitespace)."""
+    return unicodedata.normalize("NFKC", name).casefold().translate(_QUOTES).strip()
+
+
+@lru_cache(maxsize=1)
+def _station_name_to_id() -> Mapping[str, str]:
+    """Station name to ID mapping keyed by canonical names, built on first use rather than at import."""
+    mapping = {_canonical_name(station.name_ua): sid for sid, station in create_stations().items()}
+
+    # Additional mappings for aliases
+    for alias, resolved in metro_data.aliases.items():
+        mapping[_canonical_name(alias)] = mapping.get(_canonical_name(resolved), resolved)
+
+    return MappingProxyType({sys.intern(name): sid for name, sid in mapping.items()})
 
-# Additional mappings for aliases
-for alias, resolved in metro_data.aliases.items():
-    _STATION_NAME_TO_ID[alias] = _STATION_NAME_TO_ID.get(resolved.lower(), resolved)
 
 # URL mappings for lines
-LINE_URLS = {
-    DayType.WEEKDAY: SCRAPER_CONFIG["line_urls"]["weekday"],
-    DayType.WEEKEND: SCRAPER_CONFIG["line_urls"]["weekend"],
-}
+LINE_URLS: Mapping[DayType, Mapping[str, str]] = MappingProxyType(
+    {
+        DayType.WEEKDAY: SCRAPER_CONFIG["line_urls"]["weekday"],
+        DayType.WEEKEND: SCRAPER_CONFIG["line_urls"]["weekend"],
+    }
+)
 
 # Direct station URLs for Line 3 (Oleksiivska) - these are not all listed on the line page
 # Note: URLs contain typos as they appear on the website
@@ -46,8 +87,37 @@ LINE_3_STATION_URLS = {
 # Station names mapping
 STATION_NAMES = SCRAPER_CONFIG["station_names"]
 
-# Station ID mappings from URL slugs
-STATION_URL_MAPPING = SCRAPER_CONFIG["station_url_mapping"]
+# Line 3 fallback entries (station ID, display name, absolute URL), resolved once per day type
+_LINE_3_ENTRIES = {
+    day_type: [
+        (station_id, STATION_NAMES.get(station_id, station_id), _absolute_url(station_path))
+        for station_id, station_path in urls.items()
+    ]
+    for day_type, urls in LINE_3_STATION_URLS.items()
+}
+
+# Station ID mappings from URL slugs (read-only; keys are interned like the slugs probed against them)
+STATION_URL_MAPPING: Mapping[str, str] = MappingProxyType(
+    {sys.intern(slug): sid for slug, sid in SCRAPER_CONFIG["station_url_mapping"].items()}
+)
+
+# Patterns used for every link, table header and cell
+_SLUG_RE = re.compile(r'stantsiia-[«"]?([^"»]+?)["»]?(?:-\(?(?:vykhidni-dni)\)?)?\.html')
+_DIRECTION_RE = re.compile(r'[«"]([^»"]+)[»"]')
+_HOUR_RE = re.compile(r"(\d+):?")
+_MINUTES_RE = re.compile(r"(\d+)")
+
+# Only these parts of a page are read, so the parser skips building the rest of the tree
+_LINE_PAGE_STRAINER = SoupStrainer("div", class_="content-text")
+_SCHEDULE_PAGE_STRAINER = SoupStrainer(["table", "h3", "h4", "h5", "strong"])
+
+
+class StationRef(NamedTuple):
+    """Station link found on a line page."""
+
+    id: str
+    name: str
+    url: str
 
 
 def _extract_station_slug(href: str) -> str:
@@ -59,18 +129,18 @@ def _extract_station_slug(href: str) -> str:
     # - "stantsiia-«kholodna-hokra».html" (weekday)
     # - "stantsiia-«kholodna-hokra»-vykhidni-dni.html" (weekend)
     # - "stantsiia-«vokzalna»-(vykhidni-dni).html" (weekend alt)
-    match = re.search(r'stantsiia-[«"]?([^"»]+?)["»]?(?:-\(?(?:vykhidni-dni)\)?)?\.html', href)
+    match = _SLUG_RE.search(href)
     if match:
         slug = match.group(1)
-        return slug.lower()
+        return sys.intern(slug.lower())
 
     return ""
 
 
-def _parse_line_stations(html: str, day_type: DayType, line_slug: str) -> list[dict]:
+def _parse_line_stations(html: str, day_type: DayType, line_slug: str) -> list[StationRef]:
     """Parse station URLs for a line."""
-    soup = BeautifulSoup(html, "html.parser")
-    stations = []
+    soup = BeautifulSoup(html, HTML_PARSER, parse_only=_LINE_PAGE_STRAINER)
+    stations: list[StationRef] = []
 
     # Find all station links in the content
     content = soup.find("div", class_="content-text")
@@ -83,57 +153,51 @@ def _parse_line_stations(html: str, day_type: DayType, line_slug: str) -> list[d
                 station_id = STATION_URL_MAPPING.get(station_slug)
 
                 if station_id:
-                    stations.append(
-                        {
-                            "id": station_id,
-                            "name": station_name,
-                            "url": urljoin(BASE_URL, str(href)),
-                        }
-                    )
+                    stations.append(StationRef(station_id, station_name, _absolute_url(href)))
 
     # For Line 3 (Oleksiivska), add missing stations from direct URLs
     if line_slug == "oleksiivska":
-        existing_ids = {s["id"] for s in stations}
-        for station_id, station_path in LINE_3_STATION_URLS[day_type].items():
+        existing_ids = {s.id for s in stations}
+        for station_id, station_name, station_url in _LINE_3_ENTRIES[day_type]:
             if station_id not in existing_ids:
-                stations.append(
-                    {
-                        "id": station_id,
-                        "name": STATION_NAMES.get(station_id, station_id),
-                        "url": urljoin(BASE_URL, station_path),
-                    }
-                )
+                stations.append(StationRef(station_id, station_name, station_url))
 
     return stations
 
 
 def _parse_station_schedule(html: str, station_url: str, station_id: str) -> list[StationSchedule]:
     """Parse schedule for a single station."""
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, HTML_PARSER, parse_only=_SCHEDULE_PAGE_STRAINER)
     schedules = []
 
-    # Find schedule tables
-    tables = soup.find_all("table")
+    # Walk headers and tables in document order, remembering the last header seen, so each table gets its
+    # preceding header without searching backwards through the document
+    last_heading = last_strong = None
+    for element in soup.find_all(["table", "h3", "h4", "h5", "strong"]):
+        if element.name == "strong":
+            last_strong = element
+            continue
+        if element.name != "table":
+            last_heading = element
+            continue
+        table = element
 
-    for table in tables:
         # Try to determine direction from preceding header
-        prev = table.find_previous(["h3", "h4", "h5"])
-        if not prev:
-            prev = table.find_previous("strong")
+        prev = last_heading if last_heading is not None else last_strong
         direction = None
 
         if prev:
             text = prev.get_text()
             # Extract direction station name from header
-            match = re.search(r'[«"]([^»"]+)[»"]', text)
+            match = _DIRECTION_RE.search(text)
             if match:
                 direction_name = match.group(1)
                 direction = _find_station_id_by_name(direction_name)
-                print(f"    Direction found: {direction_name} -> {direction}")
+                logger.debug("Direction found: %s -> %s", direction_name, direction)
 
         if direction:
             entries = _parse_schedule_table(table)
-            print(f"    Found {len(entries)} entries")
+            logger.debug("Found %d entries", len(entries))
             if entries:
                 # Determine day type from URL
                 day_type = DayType.WEEKDAY
@@ -150,7 +214,7 @@ def _parse_station_schedule(html: str, station_url: str, station_id: str) -> lis
                 )
         else:
             debug_text = prev.get_text()[:100] if prev else "No header found"
-            print(f"    Warning: Could not determine direction from text: {debug_text}")
+            logger.warning("Could not determine direction from text: %s", debug_text)
 
     return schedules
 
@@ -161,20 +225,21 @@ def _parse_schedule_table(table) -> list[ScheduleEntry]:
     rows = table.find_all("tr")
 
     for row in rows:
-        cells = row.find_all(["td", "th"])
+        # Cells are direct children of the row; skip walking into their contents
+        cells = row.find_all(["td", "th"], recursive=False)
         if len(cells) < 2:
             continue
 
-        # First cell should contain hour
+        # First cell should contain hour; plain "5" or "5:" cells skip the regex
         hour_text = cells[0].get_text(strip=True)
-        hour_match = re.match(r"(\d+):?", hour_text)
-        if not hour_match:
-            continue
-
-        try:
+        hour_digits = hour_text.removesuffix(":")
+        if hour_digits.isdecimal():
+            hour = int(hour_digits)
+        else:
+            hour_match = _HOUR_RE.match(hour_text)
+            if not hour_match:
+                continue
             hour = int(hour_match.group(1))
-        except ValueError:
-            continue
 
         # Remaining cells contain minutes
         for cell in cells[1:]:
@@ -182,15 +247,18 @@ def _parse_schedule_table(table) -> list[ScheduleEntry]:
             if not minute_text or minute_text == "&nbsp;":
                 continue
 
-            # Extract number from text (might have * for last trains)
-            minute_match = re.search(r"(\d+)", minute_text)
-            if minute_match:
-                try:
-                    minutes = int(minute_match.group(1))
-                    if 0 <= minutes < 60:
-                        entries.append(ScheduleEntry(hour=hour, minutes=minutes))
-                except ValueError:
+            # Extract number from text (might have * for last trains); bare numbers skip the regex
+            minute_digits = minute_text.removesuffix("*")
+            if minute_digits.isdecimal():
+                minutes = int(minute_digits)
+            else:
+                minute_match = _MINUTES_RE.search(minute_text)
+                if not minute_match:
                     continue
+                minutes = int(minute_match.group(1))
+
+            if 0 <= hour < 24 and 0 <= minutes < 60:
+                entries.append(ScheduleEntry(hour=hour, minutes=minutes))
 
     return entries
 
@@ -198,24 +266,21 @@ def _parse_schedule_table(table) -> list[ScheduleEntry]:
 @lru_cache(maxsize=128)
 def _find_station_id_by_name(name: str) -> str | None:
     """Find station ID by Ukrainian name."""
-    name_lower = name.lower().strip()
+    name_key = _canonical_name(name)
 
-    # Try exact match first
-    if name_lower in _STATION_NAME_TO_ID:
-        return _STATION_NAME_TO_ID[name_lower]
+    name_to_id = _station_name_to_id()
 
-    # Try with normalized name (remove quotes, etc)
-    normalized = name_lower.replace("'", "").replace("«", "").replace("»", "").strip()
-    if normalized in _STATION_NAME_TO_ID:
-        return _STATION_NAME_TO_ID[normalized]
+    # Try exact match first
+    station_id = name_to_id.get(name_key)
+    if station_id:
+        return station_id
 
     # Try partial match
-    for station_name, station_id in _STATION_NAME_TO_ID.items():
-        if name_lower in station_name or station_name in name_lower:
+    for station_name, station_id in name_to_id.items():
+        if name_key in station_name or station_name in name_key:
             return station_id
 
-    # Debug: print what we couldn't find
-    print(f"      Could not find station ID for: '{name}'")
+    logger.warning("Could not find station ID for: %r", name)
     return None
 
 
@@ -236,16 +301,17 @@ class AsyncMetroScraper:
             try:
                 async with session.get(url, timeout=aiohttp.ClientTimeout(total=self.timeout)) as response:
                     response.raise_for_status()
-                    return await response.text()
+                    # The site serves UTF-8, so skip charset detection on bodies without a declared charset
+                    return await response.text(encoding="utf-8")
             except aiohttp.ClientError as e:
-                print(f"Error fetching {url}: {e}")
+                logger.error("Error fetching %s: %s", url, e)
                 return None
 
     async def fetch_line_stations(
         self, session: aiohttp.ClientSession, line_slug: str, day_type: DayType
-    ) -> list[dict]:
+    ) -> list[StationRef]:
         """Fetch station URLs for a line."""
-        url = urljoin(BASE_URL, LINE_URLS[day_type][line_slug])
+        url = _absolute_url(LINE_URLS[day_type][line_slug])
         html = await self._fetch(session, url)
 
         if not html:
@@ -282,16 +348,16 @@ class AsyncMetroScraper:
             schedule_tasks = []
             for (day_type, line_slug, _), stations in zip(station_tasks, station_results, strict=False):
                 if isinstance(stations, Exception):
-                    print(f"Error fetching {line_slug} for {day_type}: {stations}")
+                    logger.error("Error fetching %s for %s: %s", line_slug, day_type, stations)
                     continue
 
-                print(f"Scraping {line_slug} for {day_type.value}... ({len(stations)} stations)")
+                logger.info("Scraping %s for %s... (%d stations)", line_slug, day_type.value, len(stations))
 
                 for station in stations:
-                    station_id = station["id"]
-                    print(f"  Queuing schedule for {station['name']}...")
+                    station_id = station.id
+                    logger.debug("Queuing schedule for %s...", station.name)
 
-                    task = self.fetch_station_schedule(session, station["url"], station_id)
+                    task = self.fetch_station_schedule(session, station.url, station_id)
                     schedule_tasks.append((station_id, task))
 
             # Fetch all schedules concurrently with semaphore control
@@ -300,7 +366,7 @@ class AsyncMetroScraper:
             # Collect results
             for (station_id, _), schedules in zip(schedule_tasks, schedule_results, strict=False):
                 if isinstance(schedules, Exception):
-                    print(f"Error fetching schedule for {station_id}: {schedules}")
+                    logger.error("Error fetching schedule for %s: %s", station_id, schedules)
                     continue
 
                 if station_id not in all_schedules:
@@ -310,32 +376,102 @@ class AsyncMetroScraper:
         return all_schedules
 
 
+class _PageCache:
+    """On-disk copies of fetched pages with their ETag/Last-Modified validators, for conditional GETs."""
+
+    VALIDATORS = {"ETag": "If-None-Match", "Last-Modified": "If-Modified-Since"}
+
+    def __init__(self, directory: str | Path) -> None:
+        self.directory = Path(directory)
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        key = hashlib.sha256(url.encode()).hexdigest()
+        return self.directory / f"{key}.html", self.directory / f"{key}.json"
+
+    def load(self, url: str) -> tuple[str, dict[str, str]] | None:
+        """Return the cached page and the conditional request headers for it, if any."""
+        body_path, meta_path = self._paths(url)
+        try:
+            validators = json.loads(meta_path.read_text(encoding="utf-8"))
+            body = body_path.read_text(encoding="utf-8")
+        except (OSError, ValueError):
+            return None
+        return body, {self.VALIDATORS[name]: value for name, value in validators.items() if name in self.VALIDATORS}
+
+    def store(self, url: str, body: str, headers: Mapping[str, str]) -> None:
+        """Keep a page the server sent validators for; other pages cannot be revalidated."""
+        validators = {name: value for name in self.VALIDATORS if (value := headers.get(name))}
+        if not validators:
+            return
+        body_path, meta_path = self._paths(url)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Replace files whole so a concurrent or interrupted run never sees a partial page
+            for path, text in ((body_path, body), (meta_path, json.dumps(validators))):
+                tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+                tmp_path.write_text(text, encoding="utf-8")
+                os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("Could not cache %s: %s", url, e)
+
+
 # Backward compatibility: synchronous wrapper
 class MetroScraper:
     """Synchronous wrapper for backward compatibility."""
 
-    def __init__(self, max_concurrent: int = 10, timeout: int = 30) -> None:
+    def __init__(self, max_concurrent: int = 10, timeout: int = 30, cache_dir: str | Path | None = None) -> None:
         self.max_concurrent = max_concurrent
         self.timeout = timeout
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
         }
+        self._session: requests.Session | None = None
+        self._session_lock = threading.Lock()
+        # With a cache directory, unchanged pages are revalidated (304) instead of downloaded again
+        self._cache = _PageCache(cache_dir) if cache_dir is not None else None
+
+    def _get_session(self) -> requests.Session:
+        """Get the shared HTTP session, so every page fetch reuses pooled keep-alive connections."""
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            with self._session_lock:
+                if self._session is None:
+                    session = requests.Session()
+                    session.headers.update(self.headers)
+                    # One pooled connection per worker thread; transient gateway errors are retried with backoff
+                    # rather than losing that station's schedule for the whole run
+                    retries = Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504))
+                    adapter = HTTPAdapter(pool_maxsize=self.max_concurrent, max_retries=retries)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._session = session
+        return self._session
 
     def _fetch(self, url: str) -> str | None:
         """Fetch URL synchronously."""
         import requests
 
+        cached = self._cache.load(url) if self._cache else None
         try:
-            response = requests.get(url, headers=self.headers, timeout=self.timeout)
+            response = self._get_session().get(url, headers=cached[1] if cached else None, timeout=self.timeout)
+            if cached and response.status_code == 304:
+                return cached[0]
             response.raise_for_status()
-            return response.text
+            # The site serves UTF-8: decode the body once, without the charset guessing behind response.text
+            html = response.content.decode("utf-8", errors="replace")
+            if self._cache:
+                self._cache.store(url, html, response.headers)
+            return html
         except requests.RequestException as e:
-            print(f"Error fetching {url}: {e}")
+            logger.error("Error fetching %s: %s", url, e)
             return None
 
-    def fetch_line_stations(self, line_slug: str, day_type: DayType) -> list[dict]:
+    def fetch_line_stations(self, line_slug: str, day_type: DayType) -> list[StationRef]:
         """Fetch station URLs for a line."""
-        url = urljoin(BASE_URL, LINE_URLS[day_type][line_slug])
+        url = _absolute_url(LINE_URLS[day_type][line_slug])
         html = self._fetch(url)
 
         if not html:
@@ -351,33 +487,34 @@ class MetroScraper:
 
         return _parse_station_schedule(html, station_url, station_id)
 
-    def _fetch_station_schedule_task(self, station: dict) -> tuple[str, list[StationSchedule]]:
+    def _fetch_station_schedule_task(self, station: StationRef) -> tuple[str, list[StationSchedule]]:
         """Task for fetching a single station schedule."""
-        station_id = station["id"]
-        schedules = self.fetch_station_schedule(station["url"], station_id)
+        station_id = station.id
+        schedules = self.fetch_station_schedule(station.url, station_id)
         return station_id, schedules
 
     def scrape_all_schedules(self) -> dict[str, list[StationSchedule]]:
         """Scrape all schedules for all lines and day types with concurrency."""
         all_schedules: dict[str, list[StationSchedule]] = {}
 
-        # Collect all stations first
-        all_stations: list[tuple[DayType, str, list[dict]]] = []
-        for day_type in [DayType.WEEKDAY, DayType.WEEKEND]:
-            for line_slug in ["kholodnohirsko_zavodska", "saltivska", "oleksiivska"]:
-                print(f"Fetching station list for {line_slug} ({day_type.value})...")
-                stations = self.fetch_line_stations(line_slug, day_type)
-                all_stations.append((day_type, line_slug, stations))
-
-        # Flatten stations list for concurrent processing
-        stations_to_fetch: list[tuple[str, dict]] = []
-        for day_type, line_slug, stations in all_stations:
-            print(f"Scraping {line_slug} for {day_type.value}... ({len(stations)} stations)")
-            for station in stations:
-                stations_to_fetch.append((station["id"], station))
-
-        # Fetch all schedules concurrently using ThreadPoolExecutor
         with ThreadPoolExecutor(max_workers=self.max_concurrent) as executor:
+            # Collect all stations first; the line pages are fetched concurrently as well
+            line_futures = []
+            for day_type in [DayType.WEEKDAY, DayType.WEEKEND]:
+                for line_slug in ["kholodnohirsko_zavodska", "saltivska", "oleksiivska"]:
+                    logger.info("Fetching station list for %s (%s)...", line_slug, day_type.value)
+                    future = executor.submit(self.fetch_line_stations, line_slug, day_type)
+                    line_futures.append((day_type, line_slug, future))
+
+            # Flatten stations list for concurrent processing
+            stations_to_fetch: list[tuple[str, StationRef]] = []
+            for day_type, line_slug, future in line_futures:
+                stations = future.result()
+                logger.info("Scraping %s for %s... (%d stations)", line_slug, day_type.value, len(stations))
+                for station in stations:
+                    stations_to_fetch.append((station.id, station))
+
+            # Fetch all schedules concurrently
             future_to_station = {
                 executor.submit(self._fetch_station_schedule_task, station): (station_id, station)
                 for station_id, station in stations_to_fetch
@@ -387,11 +524,11 @@ class MetroScraper:
                 station_id, station = future_to_station[future]
                 try:
                     _, schedules = future.result()
-                    print(f"  Fetched schedule for {station['name']}: {len(schedules)} directions")
+                    logger.debug("Fetched schedule for %s: %d directions", station.name, len(schedules))
                     if station_id not in all_schedules:
                         all_schedules[station_id] = []
                     all_schedules[station_id].extend(schedules)
                 except Exception as e:
-                    print(f"  Error fetching schedule for {station['name']}: {e}")
+                    logger.error("Error fetching schedule for %s: %s", station.name, e)
 
         return all_schedules
@@ -0,0 +1,82 @@
+"""Tests for the schedule database."""
+
+import datetime as dt
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from kharkiv_metro_core.database import MetroDatabase
+from kharkiv_metro_core.models import DayType, ScheduleEntry, StationSchedule
+
+
+def _schedule(*times: tuple[int, int]) -> StationSchedule:
+    return StationSchedule(
+        station_id="kholodna_hora",
+        direction_station_id="industrialna",
+        day_type=DayType.WEEKDAY,
+        entries=[ScheduleEntry(hour=hour, minutes=minutes) for hour, minutes in times],
+    )
+
+
+def test_save_schedules_keeps_last_schedule_per_key(tmp_path):
+    db = MetroDatabase(str(tmp_path / "metro.db"))
+    try:
+        count = db.save_schedules([_schedule((5, 30), (5, 45)), _schedule((6, 0), (6, 15), (6, 30))])
+
+        saved = db.get_station_schedule("kholodna_hora", "industrialna", DayType.WEEKDAY)
+        assert count == 3
+        assert saved is not None
+        assert [(entry.hour, entry.minutes) for entry in saved.entries] == [(6, 0), (6, 15), (6, 30)]
+    finally:
+        db.close()
+
+
+def test_save_schedules_same_schedule_twice(tmp_path):
+    db = MetroDatabase(str(tmp_path / "metro.db"))
+    try:
+        schedule = _schedule((5, 30), (5, 45))
+        assert db.save_schedules([schedule, schedule]) == 2
+
+        saved = db.get_station_schedule("kholodna_hora", "industrialna", DayType.WEEKDAY)
+        assert saved is not None
+        assert len(saved.entries) == 2
+    finally:
+        db.close()
+
+
+def test_close_closes_connections_from_other_threads(tmp_path):
+    db = MetroDatabase(str(tmp_path / "metro.db"))
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(lambda _: db.get_last_departure_time(DayType.WEEKDAY), range(20)))
+    connections = list(db._thread_connections)
+    assert len(connections) > 1
+
+    db.close()
+
+    for conn in connections:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+    # The database stays usable: the calling thread opens a fresh connection
+    assert db.get_last_departure_time(DayType.WEEKDAY) is None
+    db.close()
+
+
+def test_plain_instance_keeps_journal_mode(tmp_path):
+    db = MetroDatabase(str(tmp_path / "metro.db"))
+    try:
+        with db._get_connection() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    finally:
+        db.close()
+
+
+def test_departure_times_ignore_impossible_hours(tmp_path):
+    db = MetroDatabase(str(tmp_path / "metro.db"))
+    try:
+        db.save_schedules([_schedule((5, 30), (23, 50), (81, 5))])
+
+        assert db.get_first_departure_time(DayType.WEEKDAY) == dt.time(5, 30)
+        assert db.get_last_departure_time(DayType.WEEKDAY) == dt.time(23, 50)
+    finally:
+        db.close()
@@ -0,0 +1,14 @@
+"""Tests for schedule page parsing."""
+
+from bs4 import BeautifulSoup
+
+from kharkiv_metro_core.scraper import _parse_schedule_table
+
+
+def test_parse_schedule_table_skips_impossible_hours():
+    table = BeautifulSoup(
+        "<table><tr><td>5</td><td>30</td><td>45*</td></tr><tr><td>81</td><td>05</td></tr></table>",
+        "html.parser",
+    ).table
+
+    assert [(entry.hour, entry.minutes) for entry in _parse_schedule_table(table)] == [(5, 30), (5, 45)]
@@ -4,10 +4,12 @@ from __future__ import annotations
 
 import asyncio
 import datetime as dt
+import json
 import logging
+from operator import attrgetter
 from typing import Any
 
-from kharkiv_metro_core import DayType, MetroDatabase, MetroRouter, Route, now
+from kharkiv_metro_core import DayType, Line, MetroDatabase, MetroRouter, Route, format_transfers, now
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import TextContent, Tool
@@ -201,8 +203,6 @@ class MetroMCPServer:
         else:
             text = self._format_route_text(route, lang)
 
-        import json
-
         return [
             TextContent(type="text", text=text),
             TextContent(type="text", text=json.dumps(result, indent=2, ensure_ascii=False)),
@@ -210,7 +210,8 @@ class MetroMCPServer:
 
     def _format_route_text(self, route: Route, lang: str) -> str:
         """Format route as human-readable text."""
-        name_attr = f"name_{lang}"
+        get_name = attrgetter(f"name_{lang}")
+        get_line_name = attrgetter(f"display_name_{lang}")
         lines = []
 
         if route.departure_time and route.arrival_time:
@@ -223,13 +224,13 @@ class MetroMCPServer:
         lines.append("")
 
         for i, segment in enumerate(route.segments, 1):
-            from_name = getattr(segment.from_station, name_attr)
-            to_name = getattr(segment.to_station, name_attr)
+            from_name = get_name(segment.from_station)
+            to_name = get_name(segment.to_station)
 
             if segment.is_transfer:
                 lines.append(f"{i}. Transfer: {from_name} → {to_name} ({segment.duration_minutes} min)")
             else:
-                line_name = getattr(segment.from_station.line, f"display_name_{lang}")
+                line_name = get_line_name(segment.from_station.line)
                 if segment.departure_time and segment.arrival_time:
                     dep = segment.departure_time.strftime("%H:%M")
                     arr = segment.arrival_time.strftime("%H:%M")
@@ -241,34 +242,32 @@ class MetroMCPServer:
 
     def _format_route_simple(self, route: Route, lang: str) -> str:
         """Format route in compact inline format."""
-        name_attr = f"name_{lang}"
+        get_name = attrgetter(f"name_{lang}")
 
         # Build the path showing all stations
         path_parts = []
-        added_stations = set()
+        # Routes never revisit a station, so comparing with the previous stop is enough to skip repeats
+        last_name = None
 
         # Always add the first station
         if route.segments:
             first_station = route.segments[0].from_station
-            first_name = getattr(first_station, name_attr)
-            path_parts.append(first_name)
-            added_stations.add(first_name)
+            last_name = get_name(first_station)
+            path_parts.append(last_name)
 
         # Add all stations along the route
         for segment in route.segments:
-            to_name = getattr(segment.to_station, name_attr)
+            to_name = get_name(segment.to_station)
 
             if segment.is_transfer:
                 # At transfer, add the transfer destination station
                 transfer_line = segment.to_station.line
                 transfer_color = transfer_line.color
                 path_parts.append(f"[{transfer_color}]{to_name}[/{transfer_color}]")
-                added_stations.add(to_name)
-            else:
-                # For train segments, add the destination station if not already added
-                if to_name not in added_stations:
-                    path_parts.append(to_name)
-                    added_stations.add(to_name)
+            elif to_name != last_name:
+                # For train segments, add the destination station unless it repeats the previous stop
+                path_parts.append(to_name)
+            last_name = to_name
 
         # Create the path string
         path_str = " → ".join(path_parts)
@@ -284,13 +283,7 @@ class MetroMCPServer:
         else:
             time_str = f"{total_time} min"
 
-        transfers_str = (
-            f"{transfers} пересадка"
-            if transfers == 1
-            else f"{transfers} пересадки"
-            if transfers > 0
-            else "без пересадок"
-        )
+        transfers_str = format_transfers(transfers, "ua")
 
         return f"{path_str}\n{time_str} | {transfers_str}"
 
@@ -305,12 +298,16 @@ class MetroMCPServer:
             self.logger.info("Station not found: %s", station_name)
             return [TextContent(type="text", text=f"Station not found: {station_name}")]
 
+        # Resolve the current time once for both the day type and next departures
+        current_time = now()
+        now_time = dt.time(current_time.hour, current_time.minute)
+
         # Parse day type
         day_type_str = arguments.get("day_type")
         if day_type_str:
             day_type = DayType.WEEKDAY if day_type_str == "weekday" else DayType.WEEKEND
         else:
-            day_type = DayType.WEEKDAY if now().weekday() < 5 else DayType.WEEKEND
+            day_type = DayType.WEEKDAY if current_time.weekday() < 5 else DayType.WEEKEND
 
         # Get direction if specified
         direction_id = None
@@ -337,8 +334,6 @@ class MetroMCPServer:
                 lines.append(f"Direction: {dir_name}")
 
                 # Show next few departures
-                current_time = now()
-                now_time = dt.time(current_time.hour, current_time.minute)
                 next_deps = schedule.get_next_departures(now_time, 5)
                 if next_deps:
                     lines.append("Next departures:")
@@ -357,12 +352,9 @@ class MetroMCPServer:
 
         stations_data = self.router.db.get_stations_by_line(line) if line else self.router.db.get_all_stations()
 
-        lines = []
-        for station in stations_data:
-            from kharkiv_metro_core import Line
-
-            line_name = Line(station["line"]).display_name_ua if lang == "ua" else Line(station["line"]).display_name_en
-            lines.append(f"{line_name}: {station[name_attr]}")
+        # Resolve each line's display name once instead of building a Line per row
+        line_names = {line.value: (line.display_name_ua if lang == "ua" else line.display_name_en) for line in Line}
+        lines = [f"{line_names[station['line']]}: {station[name_attr]}" for station in stations_data]
 
         return [TextContent(type="text", text="\n".join(lines))]
 